@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FavouritesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "favourites"
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.27 on 2026-10-15 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("favourites", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="favourite",
+            index=models.Index(
+                fields=["user", "-created_at"], name="fav_user_created_idx"
+            ),
+        ),
+    ]
@@ -23,6 +23,12 @@ class Favourite(models.Model):
                 name="unique_favourite_per_user_and_film",
             )
         ]
+        # Serves the per-user list ordered newest first without a sort
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="fav_user_created_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.user} → {self.film}"
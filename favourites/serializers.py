@@ -1,29 +1,27 @@
 from rest_framework import serializers
+from films.models import Film
 from .models import Favourite
 
 
-class FavouriteSerializer(serializers.ModelSerializer):
-    user = serializers.ReadOnlyField(source="user.id")
+class FavouriteSerializer(serializers.Serializer):
+    id = serializers.UUIDField(read_only=True)
+    film = serializers.PrimaryKeyRelatedField(queryset=Film.objects.all())
+    user = serializers.ReadOnlyField(source="user_id")
+    created_at = serializers.DateTimeField(read_only=True)
 
-    class Meta:
-        model = Favourite
-        fields = [
-            "id",
-            "film",
-            "user",
-            "created_at",
-        ]
-        read_only_fields = ["user", "created_at"]
+    def to_representation(self, instance):
+        # The list endpoint passes plain dicts from .values(), so render
+        # them directly instead of going through per-field attribute lookups
+        if isinstance(instance, dict):
+            return {
+                "id": str(instance["id"]),
+                "film": instance["film_id"],
+                "user": instance["user_id"],
+                "created_at": self.fields["created_at"].to_representation(
+                    instance["created_at"]
+                ),
+            }
+        return super().to_representation(instance)
 
-    def validate(self, attrs):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        film = attrs.get("film")
-
-        if request and request.method == "POST":
-            if user and user.is_authenticated and film:
-                if Favourite.objects.filter(user=user, film=film).exists():
-                    raise serializers.ValidationError(
-                        "This film is already in your favourites."
-                    )
-        return attrs
+    def create(self, validated_data):
+        return Favourite.objects.create(**validated_data)
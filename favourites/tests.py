@@ -1,11 +1,13 @@
 # favourites/tests.py
 
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from films.models import Film
+from films.services.interactions import get_user_interactions
 from .models import Favourite
 
 User = get_user_model()
@@ -13,6 +15,10 @@ User = get_user_model()
 
 class FavouriteAPITests(APITestCase):
     def setUp(self):
+        # For You interaction caches are keyed by user id, which the test
+        # database can reuse between tests
+        cache.clear()
+
         # user
         self.user = User.objects.create_user(
             username="favuser",
@@ -66,6 +72,10 @@ class FavouriteAPITests(APITestCase):
 
         second = self.client.post(self.fav_list_url, payload, format="json")
         self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            second.json(),
+            {"non_field_errors": ["This film is already in your favourites."]},
+        )
         self.assertEqual(Favourite.objects.count(), 1)
 
     def test_list_returns_only_user_favourites(self):
@@ -94,5 +104,19 @@ class FavouriteAPITests(APITestCase):
         response = self.client.get(self.fav_list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["film"], self.film.id)
+        # cursor paginated: {"next", "previous", "results"}
+        results = response.data["results"]
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["film"], self.film.id)
+
+    def test_adding_favourite_expires_cached_interactions(self):
+        self.assertEqual(
+            get_user_interactions(self.user.id)["favourited"], set()
+        )
+
+        Favourite.objects.create(user=self.user, film=self.film)
+
+        self.assertEqual(
+            get_user_interactions(self.user.id)["favourited"],
+            {self.film.id},
+        )
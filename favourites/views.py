@@ -1,8 +1,17 @@
-from rest_framework import viewsets, mixins, permissions
+from django.db import IntegrityError, transaction
+from rest_framework import viewsets, mixins, permissions, serializers
+from rest_framework.pagination import CursorPagination
+from rest_framework.settings import api_settings
 from .models import Favourite
 from .serializers import FavouriteSerializer
 
 
+class FavouriteCursorPagination(CursorPagination):
+    # Matches the (user, -created_at) index, so each page is a range scan
+    ordering = "-created_at"
+    page_size = 50
+
+
 class FavouriteViewSet(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -11,12 +20,34 @@ class FavouriteViewSet(
 ):
     serializer_class = FavouriteSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FavouriteCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
             return Favourite.objects.none()
-        return Favourite.objects.filter(user=user).select_related("film")
+        # Only ids are rendered, so skip the film join and extra columns.
+        # If film fields are ever nested here, prefer
+        # prefetch_related(Prefetch("film", queryset=Film.objects.only(...)))
+        # over select_related so each film is fetched once, narrowly.
+        queryset = Favourite.objects.filter(user=user).order_by("-created_at")
+        if self.action == "list":
+            # Rendered straight from dicts; no model instances needed
+            return queryset.values("id", "film_id", "user_id", "created_at")
+        return queryset.only("id", "film_id", "user_id", "created_at")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # The (user, film) unique constraint rejects duplicates, so there
+        # is no need to check for an existing favourite first
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            # Same body the serializer's unique validator used to return
+            raise serializers.ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "This film is already in your favourites."
+                    ]
+                }
+            )
@@ -22,6 +22,11 @@ SECRET_KEY = os.environ.get("SECRET_KEY")
 
 TMDB_API_KEY = os.environ.get("TMDB_API_KEY")
 
+# On-disk cache of TMDB film payloads and list pages used by
+# seed_tmdb_films. Set TMDB_CACHE_PATH to an empty string to disable it.
+TMDB_CACHE_PATH = os.environ.get("TMDB_CACHE_PATH", BASE_DIR / ".tmdb_cache")
+TMDB_CACHE_TTL = int(os.environ.get("TMDB_CACHE_TTL", 60 * 60 * 24 * 7))
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
 
@@ -74,6 +79,8 @@ SITE_ID = int(os.environ.get("SITE_ID", 1))
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # ETags GET responses and answers matching If-None-Match with a 304
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -141,6 +148,11 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Tests create users with passwords in their fixtures; a fast hasher keeps
+# that from dominating the run. Opt-in only, never set it in production.
+if "FAST_PASSWORD_HASHER" in os.environ:
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
 
 # Internationalization
 LANGUAGE_CODE = "en-us"
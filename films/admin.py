@@ -8,6 +8,7 @@ from .models import (
     FilmKeyword,
     FilmPerson,
 )
+from .services.compromise import invalidate_compromise_cache
 
 
 @admin.register(Film)
@@ -17,9 +18,36 @@ class FilmAdmin(admin.ModelAdmin):
     list_filter = ("year", "genres")
 
 
+class FilmLinkAdmin(admin.ModelAdmin):
+    # Link rows edited here skip the Film m2m_changed signals, so expire
+    # what is derived from them by hand
+    def films_changed(self, film_ids):
+        invalidate_compromise_cache()
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # the row may have been moved off another film
+        self.films_changed({obj.film_id, form.initial.get("film")} - {None})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self.films_changed([obj.film_id])
+
+    def delete_queryset(self, request, queryset):
+        film_ids = set(queryset.values_list("film_id", flat=True))
+        super().delete_queryset(request, queryset)
+        self.films_changed(film_ids)
+
+
+@admin.register(FilmGenre)
+class FilmGenreAdmin(FilmLinkAdmin):
+    def films_changed(self, film_ids):
+        Film.update_genre_bitmasks(film_ids)
+        super().films_changed(film_ids)
+
+
 admin.site.register(Genre)
 admin.site.register(Keyword)
 admin.site.register(Person)
-admin.site.register(FilmGenre)
-admin.site.register(FilmKeyword)
-admin.site.register(FilmPerson)
+admin.site.register(FilmKeyword, FilmLinkAdmin)
+admin.site.register(FilmPerson, FilmLinkAdmin)
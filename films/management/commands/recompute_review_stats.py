@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from films.models import Film
+
+# Films recomputed per query/bulk_update round
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored Film.average_rating and Film.review_count "
+        "from reviews. Review signals keep them current; run this to "
+        "reconcile after bulk review writes that bypass signals."
+    )
+
+    def handle(self, *args, **options):
+        film_ids = list(Film.objects.values_list("id", flat=True))
+        for start in range(0, len(film_ids), BATCH_SIZE):
+            Film.update_review_stats(film_ids[start : start + BATCH_SIZE])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed review stats for {len(film_ids)} films."
+            )
+        )
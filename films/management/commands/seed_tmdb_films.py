@@ -1,14 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from films.tmdb import (
-    fetch_discover_movies,
-    fetch_movie_details,
-    fetch_movie_keywords,
-    fetch_movie_credits,
+from films.tmdb import fetch_discover_movies
+from films.tmdb_sync import (
+    build_movie,
+    fetch_movie_payloads,
+    load_related_caches,
+    save_films,
 )
 
-from films.models import Film, Genre, Keyword, Person, FilmPerson
+from films.models import Film
+
+# How many films to fetch from TMDB at once
+FETCH_WORKERS = 8
+
+
+# A balanced set of "buckets" to avoid only-recent / only-popular bias.
+# The vote_count.gte quality filter is added per call in handle().
+_BUCKETS = (
+    # Time periods
+    {
+        "label": "70s-80s popular",
+        "params": {
+            "primary_release_date.gte": "1970-01-01",
+            "primary_release_date.lte": "1989-12-31",
+            "sort_by": "popularity.desc",
+        },
+    },
+    {
+        "label": "90s most voted",
+        "params": {
+            "primary_release_date.gte": "1990-01-01",
+            "primary_release_date.lte": "1999-12-31",
+            "sort_by": "vote_count.desc",
+        },
+    },
+    {
+        "label": "00s popular",
+        "params": {
+            "primary_release_date.gte": "2000-01-01",
+            "primary_release_date.lte": "2009-12-31",
+            "sort_by": "popularity.desc",
+        },
+    },
+    {
+        "label": "10s top rated",
+        "params": {
+            "primary_release_date.gte": "2010-01-01",
+            "primary_release_date.lte": "2019-12-31",
+            "sort_by": "vote_average.desc",
+        },
+    },
+    {
+        "label": "20s popular",
+        "params": {
+            "primary_release_date.gte": "2020-01-01",
+            "primary_release_date.lte": "2029-12-31",
+            "sort_by": "popularity.desc",
+        },
+    },
+    # Genre variety (TMDB genre IDs)
+    {
+        "label": "Comedy",
+        "params": {"with_genres": "35", "sort_by": "vote_count.desc"},
+    },
+    {
+        "label": "Drama",
+        "params": {"with_genres": "18", "sort_by": "vote_count.desc"},
+    },
+    {
+        "label": "Horror",
+        "params": {"with_genres": "27", "sort_by": "popularity.desc"},
+    },
+    {
+        "label": "Romance",
+        "params": {
+            "with_genres": "10749",
+            "sort_by": "popularity.desc",
+        },
+    },
+    {
+        "label": "Animation",
+        "params": {"with_genres": "16", "sort_by": "vote_count.desc"},
+    },
+    {
+        "label": "Documentary",
+        "params": {"with_genres": "99", "sort_by": "vote_count.desc"},
+    },
+    {
+        "label": "Sci-Fi",
+        "params": {"with_genres": "878", "sort_by": "popularity.desc"},
+    },
+    {
+        "label": "Thriller",
+        "params": {"with_genres": "53", "sort_by": "popularity.desc"},
+    },
+)
 
 
 class Command(BaseCommand):
@@ -59,267 +147,130 @@ class Command(BaseCommand):
             f"DB has {existing_count} films. Target is {target}. Seeding..."
         )
 
+        # Tracked locally from here on instead of re-counting the table
+        current_total = existing_count
         created_count = 0
         updated_count = 0
         skipped_existing = 0
 
-        # A balanced set of "buckets" to avoid only-recent / only-popular bias
-        buckets = [
-            # Time periods
-            {
-                "label": "70s-80s popular",
-                "params": {
-                    "primary_release_date.gte": "1970-01-01",
-                    "primary_release_date.lte": "1989-12-31",
-                    "sort_by": "popularity.desc",
-                },
-            },
-            {
-                "label": "90s most voted",
-                "params": {
-                    "primary_release_date.gte": "1990-01-01",
-                    "primary_release_date.lte": "1999-12-31",
-                    "sort_by": "vote_count.desc",
-                },
-            },
-            {
-                "label": "00s popular",
-                "params": {
-                    "primary_release_date.gte": "2000-01-01",
-                    "primary_release_date.lte": "2009-12-31",
-                    "sort_by": "popularity.desc",
-                },
-            },
-            {
-                "label": "10s top rated",
-                "params": {
-                    "primary_release_date.gte": "2010-01-01",
-                    "primary_release_date.lte": "2019-12-31",
-                    "sort_by": "vote_average.desc",
-                },
-            },
-            {
-                "label": "20s popular",
-                "params": {
-                    "primary_release_date.gte": "2020-01-01",
-                    "primary_release_date.lte": "2029-12-31",
-                    "sort_by": "popularity.desc",
-                },
-            },
-            # Genre variety (TMDB genre IDs)
-            {
-                "label": "Comedy",
-                "params": {"with_genres": "35", "sort_by": "vote_count.desc"},
-            },
-            {
-                "label": "Drama",
-                "params": {"with_genres": "18", "sort_by": "vote_count.desc"},
-            },
-            {
-                "label": "Horror",
-                "params": {"with_genres": "27", "sort_by": "popularity.desc"},
-            },
-            {
-                "label": "Romance",
-                "params": {
-                    "with_genres": "10749",
-                    "sort_by": "popularity.desc",
-                },
-            },
-            {
-                "label": "Animation",
-                "params": {"with_genres": "16", "sort_by": "vote_count.desc"},
-            },
-            {
-                "label": "Documentary",
-                "params": {"with_genres": "99", "sort_by": "vote_count.desc"},
-            },
-            {
-                "label": "Sci-Fi",
-                "params": {"with_genres": "878", "sort_by": "popularity.desc"},
-            },
-            {
-                "label": "Thriller",
-                "params": {"with_genres": "53", "sort_by": "popularity.desc"},
-            },
-        ]
-
-        # Apply a quality filter everywhere
-        for b in buckets:
-            b["params"]["vote_count.gte"] = min_vote_count
-
-        # Helper: one movie -> your existing save logic
-        def upsert_movie(tmdb_id: int, teaser: dict):
-            nonlocal created_count, updated_count
-
-            title = teaser.get("title") or teaser.get("name") or "Untitled"
-            release_date = teaser.get("release_date") or ""
-            year = None
-            if release_date:
-                try:
-                    year = int(release_date.split("-")[0])
-                except (ValueError, IndexError):
-                    year = None
-
-            poster_path = teaser.get("poster_path") or ""
-            critic_score = teaser.get("vote_average") or 0.0
-            popularity = teaser.get("popularity") or 0.0
-            vote_count = teaser.get("vote_count") or 0
-
-            details = fetch_movie_details(tmdb_id)
-            runtime = details.get("runtime")
-            overview = details.get("overview")
-
-            # If year missing in teaser, try from details
-            if not year:
-                rd = details.get("release_date") or ""
-                if rd:
-                    try:
-                        year = int(rd.split("-")[0])
-                    except (ValueError, IndexError):
-                        year = None
-
-            # Your model requires year (PositiveIntegerField)
-            if not year:
-                return False  # skip films without a year
-
-            film_defaults = {
-                "title": title,
-                "year": year,
-                "overview": overview,
-                "poster_path": poster_path,
-                "runtime": runtime,
-                "critic_score": critic_score,
-                "popularity": popularity,
-                "vote_count": vote_count,
-                "last_synced_at": timezone.now(),
-            }
-
-            film, created = Film.objects.update_or_create(
-                tmdb_id=tmdb_id, defaults=film_defaults
-            )
-
-            if created:
-                created_count += 1
-                action = "Created"
-            else:
-                updated_count += 1
-                action = "Updated"
-
-            self.stdout.write(f"{action} film: {film.title} ({tmdb_id})")
-
-            # ---------- Genres ----------
-            tmdb_genres = details.get("genres", [])
-            genre_instances = []
-            for g in tmdb_genres:
-                genre, _ = Genre.objects.get_or_create(
-                    tmdb_id=g["id"],
-                    defaults={"id": g["id"], "name": g["name"]},
-                )
-                genre_instances.append(genre)
-            if hasattr(film, "genres"):
-                film.genres.set(genre_instances)
-
-            # ---------- Keywords ----------
-            keywords_payload = fetch_movie_keywords(tmdb_id)
-            tmdb_keywords = keywords_payload.get("keywords", [])
-            keyword_instances = []
-            for kw in tmdb_keywords[:10]:
-                keyword, _ = Keyword.objects.get_or_create(
-                    tmdb_id=kw["id"],
-                    defaults={"id": kw["id"], "name": kw["name"]},
-                )
-                keyword_instances.append(keyword)
-            if hasattr(film, "keywords"):
-                film.keywords.set(keyword_instances)
-
-            # ---------- People (directors + top 5 cast) ----------
-            credits = fetch_movie_credits(tmdb_id)
-            people_for_film = []
-
-            for crew_member in credits.get("crew", []):
-                if crew_member.get("job") == "Director":
-                    person, _ = Person.objects.get_or_create(
-                        tmdb_id=crew_member["id"],
-                        defaults={
-                            "id": crew_member["id"],
-                            "name": crew_member["name"],
-                        },
-                    )
-                    people_for_film.append((person, "director", 0))
-
-            for cast_member in credits.get("cast", [])[:5]:
-                person, _ = Person.objects.get_or_create(
-                    tmdb_id=cast_member["id"],
-                    defaults={
-                        "id": cast_member["id"],
-                        "name": cast_member["name"],
-                    },
-                )
-                order = cast_member.get("order") or 0
-                people_for_film.append((person, "cast", order))
-
-            for person, role, billing_order in people_for_film:
-                FilmPerson.objects.update_or_create(
-                    film=film,
-                    person=person,
-                    role=role,
-                    defaults={"billing_order": billing_order},
-                )
-
-            return True
+        genre_cache, keyword_cache = load_related_caches()
 
         # Seed loop
-        for bucket in buckets:
-            current_total = Film.objects.exclude(tmdb_id__isnull=True).count()
-            if current_total >= target:
-                break
-
-            self.stdout.write(f"\n=== Bucket: {bucket['label']} ===")
-
-            for page in range(1, pages_per_bucket + 1):
-                current_total = Film.objects.exclude(
-                    tmdb_id__isnull=True
-                ).count()
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for bucket in _BUCKETS:
                 if current_total >= target:
                     break
 
-                self.stdout.write(
-                    f"Fetching discover page {page} ({bucket['label']})..."
-                )
-                data = fetch_discover_movies(page=page, **bucket["params"])
-                results = data.get("results", [])
+                self.stdout.write(f"\n=== Bucket: {bucket['label']} ===")
 
-                if not results:
-                    break
+                # A bucket's discover pages do not depend on each other, so
+                # request them all up front instead of one after another
+                page_futures = [
+                    executor.submit(
+                        fetch_discover_movies,
+                        page=page,
+                        **bucket["params"],
+                        **{"vote_count.gte": min_vote_count},
+                    )
+                    for page in range(1, pages_per_bucket + 1)
+                ]
 
-                for teaser in results:
-                    current_total = Film.objects.exclude(
-                        tmdb_id__isnull=True
-                    ).count()
+                for page, page_future in enumerate(page_futures, start=1):
                     if current_total >= target:
                         break
 
-                    tmdb_id = teaser.get("id")
-                    if not tmdb_id:
-                        continue
-
-                    # Check if already in DB
-                    already_exists = Film.objects.filter(
-                        tmdb_id=tmdb_id
-                    ).exists()
-                    if already_exists:
-                        skipped_existing += 1
-                        # Still update to refresh vote_count and other fields
-                        upsert_movie(tmdb_id, teaser)
-                    else:
-                        upsert_movie(tmdb_id, teaser)
-
-        final_total = Film.objects.exclude(tmdb_id__isnull=True).count()
+                    self.stdout.write(
+                        f"Fetching discover page {page} "
+                        f"({bucket['label']})..."
+                    )
+                    data = page_future.result()
+                    results = data.get("results", [])
+
+                    if not results:
+                        break
+
+                    # One lookup for the whole page instead of an EXISTS
+                    # query per teaser; the primary keys let build_movie
+                    # target existing rows without reading them back later
+                    existing = Film.objects.only("id", "tmdb_id").in_bulk(
+                        [t["id"] for t in results if t.get("id")],
+                        field_name="tmdb_id",
+                    )
+
+                    # Pick the teasers to sync before hitting TMDB for them
+                    selected = []
+                    page_tmdb_ids = set()
+                    page_new = 0
+
+                    for teaser in results:
+                        # Films in this page are not saved yet, so count
+                        # them towards the target alongside the DB total
+                        if current_total + page_new >= target:
+                            break
+
+                        tmdb_id = teaser.get("id")
+                        # One upsert per row: Postgres rejects a batch that
+                        # touches the same tmdb_id twice
+                        if not tmdb_id or tmdb_id in page_tmdb_ids:
+                            continue
+                        page_tmdb_ids.add(tmdb_id)
+
+                        existing_film = existing.get(tmdb_id)
+                        if existing_film is not None:
+                            # Still update to refresh vote_count and others
+                            skipped_existing += 1
+                        else:
+                            page_new += 1
+
+                        selected.append((tmdb_id, teaser, existing_film))
+
+                    # Fetch the page's TMDB payloads concurrently
+                    futures = {
+                        executor.submit(fetch_movie_payloads, tmdb_id): (
+                            tmdb_id,
+                            teaser,
+                            existing_film,
+                        )
+                        for tmdb_id, teaser, existing_film in selected
+                    }
+
+                    batch = []
+                    for future in as_completed(futures):
+                        tmdb_id, teaser, existing_film = futures[future]
+                        built = build_movie(
+                            tmdb_id,
+                            teaser,
+                            *future.result(),
+                            existing=existing_film,
+                        )
+                        if built is None:
+                            continue
+
+                        if existing_film is not None:
+                            updated_count += 1
+                            action = "Updated"
+                        else:
+                            created_count += 1
+                            current_total += 1
+                            action = "Created"
+
+                        film, _ = built
+                        self.stdout.write(
+                            f"{action} film: {film.title} ({tmdb_id})"
+                        )
+                        batch.append(built)
+
+                    if batch:
+                        save_films(batch, genre_cache, keyword_cache)
+
+                # Drop any pages still queued once the target is reached
+                for page_future in page_futures:
+                    page_future.cancel()
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"Done. Created {created_count}, updated {updated_count}, "
                 f"skipped existing {skipped_existing}. "
-                f"DB total now: {final_total} (target {target})."
+                f"DB total now: {current_total} (target {target})."
             )
         )
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "films",
+            "0003_film_vote_count_film_films_film_year_30d277_idx_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="film",
+            index=models.Index(
+                condition=models.Q(("tmdb_id__isnull", False)),
+                fields=["tmdb_id"],
+                name="film_tmdb_idx",
+            ),
+        ),
+    ]
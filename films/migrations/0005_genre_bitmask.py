@@ -0,0 +1,51 @@
+# Generated by Django 4.2.27 on 2026-10-15 22:58
+
+from django.db import migrations, models
+
+
+def backfill_genre_bitmasks(apps, schema_editor):
+    Genre = apps.get_model("films", "Genre")
+    Film = apps.get_model("films", "Film")
+    FilmGenre = apps.get_model("films", "FilmGenre")
+
+    genres = list(Genre.objects.order_by("id"))
+    for bit, genre in enumerate(genres):
+        genre.bit = bit
+    Genre.objects.bulk_update(genres, ["bit"])
+
+    masks = {}
+    for film_id, bit in FilmGenre.objects.values_list("film_id", "genre__bit"):
+        masks[film_id] = masks.get(film_id, 0) | (1 << bit)
+    Film.objects.bulk_update(
+        [
+            Film(id=film_id, genre_bitmask=mask)
+            for film_id, mask in masks.items()
+        ],
+        ["genre_bitmask"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("films", "0004_film_tmdb_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="film",
+            name="genre_bitmask",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="genre",
+            name="bit",
+            field=models.PositiveSmallIntegerField(
+                blank=True, editable=False, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(
+            backfill_genre_bitmasks, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("films", "0005_genre_bitmask"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="filmgenre",
+            name="films_filmg_genre_i_895ec0_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="filmkeyword",
+            name="films_filmk_keyword_b508e1_idx",
+        ),
+        migrations.AddIndex(
+            model_name="filmgenre",
+            index=models.Index(
+                fields=["genre", "film"], name="films_filmg_genre_i_bc5af5_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="filmkeyword",
+            index=models.Index(
+                fields=["keyword", "film"],
+                name="films_filmk_keyword_2d4318_idx",
+            ),
+        ),
+    ]
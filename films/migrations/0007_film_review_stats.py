@@ -0,0 +1,51 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:05
+
+from django.db import migrations, models
+
+
+def backfill_review_stats(apps, schema_editor):
+    Film = apps.get_model("films", "Film")
+    Review = apps.get_model("reviews", "Review")
+
+    stats = (
+        Review.objects.values("film_id")
+        .annotate(
+            stored_average=models.Avg("rating"),
+            stored_count=models.Count("id"),
+        )
+        .order_by()
+    )
+    Film.objects.bulk_update(
+        [
+            Film(
+                id=row["film_id"],
+                average_rating=row["stored_average"],
+                review_count=row["stored_count"],
+            )
+            for row in stats
+        ],
+        ["average_rating", "review_count"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("films", "0006_through_table_composite_idx"),
+        ("reviews", "0002_alter_review_rating"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="film",
+            name="average_rating",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="film",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:07
+
+from django.db import migrations, models
+
+ROLE_CODES = {"director": "1", "cast": "2"}
+
+
+def roles_to_codes(apps, schema_editor):
+    FilmPerson = apps.get_model("films", "FilmPerson")
+    for name, code in ROLE_CODES.items():
+        FilmPerson.objects.filter(role=name).update(role=code)
+
+
+def codes_to_roles(apps, schema_editor):
+    FilmPerson = apps.get_model("films", "FilmPerson")
+    for name, code in ROLE_CODES.items():
+        FilmPerson.objects.filter(role=code).update(role=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("films", "0007_film_review_stats"),
+    ]
+
+    operations = [
+        # Rewrite the role names as numeric strings first so the column
+        # type change below can cast them in place
+        migrations.RunPython(roles_to_codes, codes_to_roles),
+        migrations.AlterField(
+            model_name="filmperson",
+            name="role",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "Director"), (2, "Cast")]
+            ),
+        ),
+    ]
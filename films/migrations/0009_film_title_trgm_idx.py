@@ -0,0 +1,36 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:40
+
+from django.db import migrations
+
+# Django's title__icontains compiles to UPPER(title) LIKE UPPER(%s) on
+# PostgreSQL, so the trigram index is built over the same expression
+CREATE_INDEX = (
+    "CREATE INDEX IF NOT EXISTS film_title_trgm_idx ON films_film "
+    'USING gin (UPPER("title") gin_trgm_ops)'
+)
+DROP_INDEX = "DROP INDEX IF EXISTS film_title_trgm_idx"
+
+
+def create_title_trgm_index(apps, schema_editor):
+    # pg_trgm is PostgreSQL only; SQLite dev databases keep scanning
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(CREATE_INDEX)
+
+
+def drop_title_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("films", "0008_filmperson_role_smallint"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_trgm_index, drop_title_trgm_index),
+    ]
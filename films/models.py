@@ -1,12 +1,19 @@
 import uuid
 from django.db import models
 
+# Film.genre_bitmask is a signed 64-bit column, so bits 0-62 are usable
+GENRE_BITMASK_SIZE = 63
+
 
 class Genre(models.Model):
     # ERD: id int [pk], name, tmdb_id unique
     id = models.IntegerField(primary_key=True)
     name = models.CharField(max_length=100)
     tmdb_id = models.IntegerField(unique=True)
+    # Position of this genre in Film.genre_bitmask, assigned on first save
+    bit = models.PositiveSmallIntegerField(
+        unique=True, null=True, blank=True, editable=False
+    )
 
     class Meta:
         ordering = ["name"]
@@ -14,6 +21,22 @@ class Genre(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if self.bit is None:
+            (self.bit,) = Genre.free_bits(1)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def free_bits(cls, count):
+        """Return `count` Film.genre_bitmask positions no genre uses yet."""
+        used = set(cls.objects.exclude(bit=None).values_list("bit", flat=True))
+        free = [bit for bit in range(GENRE_BITMASK_SIZE) if bit not in used]
+        if len(free) < count:
+            raise ValueError(
+                "No free Film.genre_bitmask bits left for new genres."
+            )
+        return free[:count]
+
 
 class Keyword(models.Model):
     # ERD: id int [pk], name, tmdb_id unique
@@ -81,17 +104,112 @@ class Film(models.Model):
     # Add vote_count for filtering high-quality films
     vote_count = models.PositiveIntegerField(default=0)
 
+    # One bit per genre (see Genre.bit), kept in sync with `genres` so
+    # overlap scoring can read a film's genres without a join
+    genre_bitmask = models.BigIntegerField(default=0, editable=False)
+
+    # Review stats kept up to date by reviews.signals, so film lists can
+    # read them without aggregating over reviews per request
+    average_rating = models.FloatField(null=True, blank=True, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         ordering = ["-year", "title"]
         indexes = [
             models.Index(fields=["year"]),
             models.Index(fields=["vote_count"]),
             models.Index(fields=["popularity"]),
+            # Only TMDB-synced films; backs the seed command's count/lookups
+            models.Index(
+                fields=["tmdb_id"],
+                name="film_tmdb_idx",
+                condition=models.Q(tmdb_id__isnull=False),
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} ({self.year})"
 
+    @classmethod
+    def update_genre_bitmasks(cls, film_ids):
+        """
+        Recompute genre_bitmask from FilmGenre for the given films.
+
+        Changes made through Film.genres keep it in step via m2m_changed;
+        code that writes FilmGenre rows directly must call this itself.
+        """
+        masks = dict.fromkeys(film_ids, 0)
+        for film_id, bit in FilmGenre.objects.filter(
+            film_id__in=masks
+        ).values_list("film_id", "genre__bit"):
+            masks[film_id] |= 1 << bit
+        cls.objects.bulk_update(
+            [
+                cls(id=film_id, genre_bitmask=mask)
+                for film_id, mask in masks.items()
+            ],
+            ["genre_bitmask"],
+        )
+
+    @classmethod
+    def update_review_stats(cls, film_ids):
+        """Recompute average_rating and review_count for the given films."""
+        stats = cls.objects.filter(id__in=film_ids).annotate(
+            stored_average=models.Avg("reviews__rating"),
+            stored_count=models.Count("reviews"),
+        )
+        cls.objects.bulk_update(
+            [
+                cls(
+                    id=film_id,
+                    average_rating=average_rating,
+                    review_count=review_count,
+                )
+                for film_id, average_rating, review_count in stats.values_list(
+                    "id", "stored_average", "stored_count"
+                )
+            ],
+            ["average_rating", "review_count"],
+        )
+
+    # Concrete columns FilmSerializer renders
+    API_FIELDS = (
+        "id",
+        "tmdb_id",
+        "title",
+        "overview",
+        "year",
+        "poster_path",
+        "runtime",
+        "critic_score",
+        "popularity",
+        "last_synced_at",
+        "average_rating",
+        "review_count",
+    )
+
+    @classmethod
+    def api_queryset(cls):
+        """
+        Films with only the columns FilmSerializer renders loaded and the
+        relations it renders prefetched.
+
+        Views that serialize films with FilmSerializer (or a subclass)
+        should start from this queryset so the nested lists cost one query
+        per relation rather than one per film.
+        """
+        return cls.objects.only(*cls.API_FIELDS).prefetch_related(
+            models.Prefetch(
+                "genres", queryset=Genre.objects.only("id", "name")
+            ),
+            models.Prefetch(
+                "keywords", queryset=Keyword.objects.only("id", "name")
+            ),
+            models.Prefetch(
+                "people", queryset=Person.objects.only("id", "name")
+            ),
+        )
+
 
 class FilmGenre(models.Model):
     # ERD: id uuid [pk], film_id, genre_id, created_at, unique
@@ -107,7 +225,8 @@ class FilmGenre(models.Model):
     class Meta:
         unique_together = ("film", "genre")
         indexes = [
-            models.Index(fields=["genre"]),
+            # Covers genre lookups and returns film_id from the index alone
+            models.Index(fields=["genre", "film"]),
             models.Index(fields=["film"]),
         ]
 
@@ -129,7 +248,8 @@ class FilmKeyword(models.Model):
     class Meta:
         unique_together = ("film", "keyword")
         indexes = [
-            models.Index(fields=["keyword"]),
+            # Covers keyword lookups and returns film_id from the index alone
+            models.Index(fields=["keyword", "film"]),
             models.Index(fields=["film"]),
         ]
 
@@ -140,10 +260,9 @@ class FilmKeyword(models.Model):
 class FilmPerson(models.Model):
     # ERD: id uuid [pk], film_id, person_id, role, billing_order,
     # unique (film_id, person_id, role)
-    ROLE_CHOICES = [
-        ("director", "Director"),
-        ("cast", "Cast"),
-    ]
+    class Role(models.IntegerChoices):
+        DIRECTOR = 1, "Director"
+        CAST = 2, "Cast"
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     film = models.ForeignKey(
@@ -152,7 +271,9 @@ class FilmPerson(models.Model):
     person = models.ForeignKey(
         Person, on_delete=models.CASCADE, related_name="film_people"
     )
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    # Small integer rather than a varchar, as it sits in every row and in
+    # the (person, role) index
+    role = models.PositiveSmallIntegerField(choices=Role.choices)
     billing_order = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
@@ -164,4 +285,4 @@ class FilmPerson(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.person} ({self.role}) – {self.film}"
+        return f"{self.person} ({self.get_role_display()}) – {self.film}"
@@ -1,34 +1,82 @@
+import copy
+
 from rest_framework import serializers
-from .models import Film, Genre, Keyword, Person
+from .models import Film
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer's fields once per class instead of on every
+    instantiation; DRF otherwise deep-copies them for each serializer.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        # Fields are bound to their parent, so hand out fresh copies; nested
+        # serializers still get a deep copy so their children bind to them
+        return {
+            name: (
+                copy.deepcopy(field)
+                if isinstance(field, serializers.BaseSerializer)
+                else copy.copy(field)
+            )
+            for name, field in fields.items()
+        }
 
 
-class GenreSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Genre
-        fields = ["id", "name"]
+class IdNameListField(serializers.Field):
+    """
+    Render a to-many relation as a list of {"id", "name"} dicts.
 
+    Same output as a nested `many=True` id/name ModelSerializer, without
+    a ListSerializer and a ModelSerializer pass per related row.
+    Reads through .all(), so prefetched rows are used when present.
+    """
 
-class KeywordSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Keyword
-        fields = ["id", "name"]
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
 
+    def to_representation(self, value):
+        return [{"id": obj.id, "name": obj.name} for obj in value.all()]
 
-class PersonSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Person
-        fields = ["id", "name"]
 
+class UserFilmFlagField(serializers.Field):
+    """
+    Render whether the film is in one of the requesting user's film id
+    sets, passed in the serializer context under `context_key`.
+
+    Without that context entry the flag is read from the film itself, as
+    annotated by the view (e.g. with an Exists() subquery).
+    """
 
-class FilmSerializer(serializers.ModelSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
-    keywords = KeywordSerializer(many=True, read_only=True)
-    people = PersonSerializer(many=True, read_only=True)
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        kwargs["read_only"] = True
+        kwargs["source"] = "*"
+        super().__init__(**kwargs)
+
+    def to_representation(self, film):
+        film_ids = self.context.get(self.context_key)
+        if film_ids is None:
+            return getattr(film, self.field_name)
+        return film.pk in film_ids
+
+
+class FilmSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    genres = IdNameListField()
+    keywords = IdNameListField()
+    people = IdNameListField()
 
     average_rating = serializers.FloatField(read_only=True)
     review_count = serializers.IntegerField(read_only=True)
-    is_favourited = serializers.BooleanField(read_only=True)
-    in_watchlist = serializers.BooleanField(read_only=True)
+    is_favourited = UserFilmFlagField("favourite_film_ids")
+    in_watchlist = UserFilmFlagField("watchlist_film_ids")
 
     class Meta:
         model = Film
@@ -56,30 +104,33 @@ class FilmSerializer(serializers.ModelSerializer):
 class ForYouFilmSerializer(FilmSerializer):
     """Extends FilmSerializer with recommendation-specific fields."""
 
-    match_score = serializers.IntegerField(read_only=True)
-    reasons = serializers.ListField(
-        child=serializers.CharField(),
-        read_only=True,
-    )
-
-    class Meta(FilmSerializer.Meta):
-        fields = FilmSerializer.Meta.fields + ["match_score", "reasons"]
-
-
-class FilmCardLiteSerializer(serializers.ModelSerializer):
-    """Lightweight film card for /compromise/ and similar endpoints."""
-
-    class Meta:
-        model = Film
-        fields = [
-            "id",
-            "title",
-            "year",
-            "poster_path",
-            "runtime",
-            "critic_score",
-            "popularity",
-        ]
+    def to_representation(self, instance):
+        # match_score and reasons are set on the film by ForYouView as an
+        # int and a list of str, so pass them through without field coercion
+        data = super().to_representation(instance)
+        data["match_score"] = instance.match_score
+        data["reasons"] = instance.reasons
+        return data
+
+
+class FilmCardLiteSerializer(serializers.Serializer):
+    """
+    Lightweight, read-only film card for /compromise/ and similar
+    endpoints: id, title, year, poster_path, runtime, critic_score and
+    popularity.
+    """
+
+    def to_representation(self, instance):
+        # Fixed scalar fields, so skip DRF's per-field attribute lookups
+        return {
+            "id": str(instance.id),
+            "title": instance.title,
+            "year": instance.year,
+            "poster_path": instance.poster_path,
+            "runtime": instance.runtime,
+            "critic_score": instance.critic_score,
+            "popularity": instance.popularity,
+        }
 
 
 class CompromiseRequestSerializer(serializers.Serializer):
@@ -3,10 +3,20 @@ Compromise/Blend Mode service for finding films that blend two selected films.
 
 Scoring is based on weighted Jaccard similarity of genres and keywords,
 with a bonus for films overlapping with both input films.
+
+Genre sets come from the denormalized Film.genre_bitmask column; keyword
+sets are encoded as integer bitmasks over the ids of the two input films.
+Either way each Jaccard intersection is a single AND + popcount.
 """
 
-from typing import Dict, List, Tuple, Set
-from films.models import Film
+import functools
+import heapq
+import time
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Set
+
+from django.core.cache import cache
+
+from films.models import Film, FilmGenre, FilmKeyword
 
 
 # Scoring weights and bonuses
@@ -15,64 +25,119 @@ KEYWORD_WEIGHT = 0.55
 BOTH_GENRES_BONUS = 0.05
 BOTH_KEYWORDS_BONUS = 0.10
 
+# Results only change when films or their genres/keywords change, which
+# bumps the cache version below. CACHES is not configured, so each process
+# has its own LocMemCache and a bump only reaches the process that made
+# it; the short timeout bounds staleness everywhere else.
+COMPROMISE_CACHE_TIMEOUT = 5 * 60
+_CACHE_VERSION_KEY = "compromise:version"
+
+# Film columns needed to render a candidate with FilmCardLiteSerializer
+CANDIDATE_FIELDS = (
+    "id",
+    "title",
+    "year",
+    "poster_path",
+    "runtime",
+    "critic_score",
+    "popularity",
+)
+
+
+def _bitmask(ids: Iterable[int], bit_index: Dict[int, int]) -> int:
+    """
+    Encode the ids that appear in bit_index as an integer bitmask.
+
+    Args:
+        ids: Genre or keyword IDs
+        bit_index: Maps each relevant ID to its bit position
+
+    Returns:
+        int with one bit set per relevant ID
+    """
+    mask = 0
+    for item_id in ids:
+        bit = bit_index.get(item_id)
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Yield the positions of the set bits in mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
 
-def _jaccard_similarity(set_a: Set, set_b: Set) -> float:
+def _jaccard_similarity(
+    mask_a: int, size_a: int, mask_b: int, size_b: int
+) -> float:
     """
-    Compute Jaccard similarity between two sets.
+    Compute Jaccard similarity between two sets from their bitmasks.
+
+    Only the intersection needs the masks; the union follows from the full
+    set sizes, so ids outside the bit universe still count towards it.
 
     Args:
-        set_a: First set
-        set_b: Second set
+        mask_a: Bitmask of the first set
+        size_a: Number of items in the first set
+        mask_b: Bitmask of the second set
+        size_b: Number of items in the second set
 
     Returns:
         float between 0 and 1
     """
-    if not set_a and not set_b:
-        return 0.0
-
-    intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
+    intersection = (mask_a & mask_b).bit_count()
+    union = size_a + size_b - intersection
 
     return intersection / union if union > 0 else 0.0
 
 
 def _compute_similarity_score(
-    candidate_genres: Set[int],
-    candidate_keywords: Set[int],
-    film_genres: Set[int],
-    film_keywords: Set[int],
-) -> Tuple[float, Dict[str, float]]:
+    candidate_genres: Tuple[int, int],
+    candidate_keywords: Tuple[int, int],
+    film_genres: Tuple[int, int],
+    film_keywords: Tuple[int, int],
+) -> Tuple[float, float, float]:
     """
     Compute weighted similarity score between candidate and a reference film.
 
     Args:
-        candidate_genres: Set of genre IDs for the candidate film
-        candidate_keywords: Set of keyword IDs for the candidate film
-        film_genres: Set of genre IDs for the reference film
-        film_keywords: Set of keyword IDs for the reference film
+        candidate_genres: (bitmask, size) of the candidate's genres
+        candidate_keywords: (bitmask, size) of the candidate's keywords
+        film_genres: (bitmask, size) of the reference film's genres
+        film_keywords: (bitmask, size) of the reference film's keywords
 
     Returns:
-        Tuple of (score, breakdown_dict)
+        Tuple of (score, genre_overlap, keyword_overlap)
     """
-    genre_sim = _jaccard_similarity(candidate_genres, film_genres)
-    keyword_sim = _jaccard_similarity(candidate_keywords, film_keywords)
+    genre_sim = _jaccard_similarity(*candidate_genres, *film_genres)
+    keyword_sim = _jaccard_similarity(*candidate_keywords, *film_keywords)
 
     score = GENRE_WEIGHT * genre_sim + KEYWORD_WEIGHT * keyword_sim
 
-    breakdown = {
-        "genre_overlap": genre_sim,
-        "keyword_overlap": keyword_sim,
-    }
+    return score, genre_sim, keyword_sim
 
-    return score, breakdown
+
+@functools.lru_cache(maxsize=4096)
+def _format_names(names: FrozenSet[str]) -> str:
+    """
+    Join names in sorted order for an explanation string.
+
+    Shared names come from the small A/B tag universe, so the same sets
+    repeat across candidates and requests and are worth caching.
+    """
+    return ", ".join(sorted(names))
 
 
 def _build_explanation_strings(
     candidate: Film,
-    shared_genres_a: Set[str],
-    shared_genres_b: Set[str],
-    shared_keywords_a: Set[str],
-    shared_keywords_b: Set[str],
+    shared_genres_a: FrozenSet[str],
+    shared_genres_b: FrozenSet[str],
+    shared_keywords_a: FrozenSet[str],
+    shared_keywords_b: FrozenSet[str],
 ) -> List[str]:
     """
     Build human-readable explanation strings for why this film was recommended.
@@ -93,60 +158,95 @@ def _build_explanation_strings(
     both_genres = shared_genres_a & shared_genres_b
     if both_genres:
         reasons.append(
-            f"Shared genres with both: {', '.join(sorted(both_genres))}"
+            f"Shared genres with both: {_format_names(both_genres)}"
         )
 
     # Genres shared with only A
     only_a_genres = shared_genres_a - shared_genres_b
     if only_a_genres:
-        reasons.append(
-            f"Shared genres with A: {', '.join(sorted(only_a_genres))}"
-        )
+        reasons.append(f"Shared genres with A: {_format_names(only_a_genres)}")
 
     # Genres shared with only B
     only_b_genres = shared_genres_b - shared_genres_a
     if only_b_genres:
-        reasons.append(
-            f"Shared genres with B: {', '.join(sorted(only_b_genres))}"
-        )
+        reasons.append(f"Shared genres with B: {_format_names(only_b_genres)}")
 
     # Keywords shared with both
     both_keywords = shared_keywords_a & shared_keywords_b
     if both_keywords:
         reasons.append(
-            f"Shared keywords with both: {', '.join(sorted(both_keywords))}"
+            f"Shared keywords with both: {_format_names(both_keywords)}"
         )
 
     # Keywords shared with only A
     only_a_keywords = shared_keywords_a - shared_keywords_b
     if only_a_keywords:
         reasons.append(
-            f"Shared keywords with A: {', '.join(sorted(only_a_keywords))}"
+            f"Shared keywords with A: {_format_names(only_a_keywords)}"
         )
 
     # Keywords shared with only B
     only_b_keywords = shared_keywords_b - shared_keywords_a
     if only_b_keywords:
         reasons.append(
-            f"Shared keywords with B: {', '.join(sorted(only_b_keywords))}"
+            f"Shared keywords with B: {_format_names(only_b_keywords)}"
         )
 
     return reasons
 
 
+def invalidate_compromise_cache() -> None:
+    """Drop every cached compromise result (call after catalog changes)."""
+    try:
+        cache.incr(_CACHE_VERSION_KEY)
+    except ValueError:
+        # No version stored yet (or it was evicted): start a fresh one
+        cache.set(_CACHE_VERSION_KEY, time.time_ns(), None)
+
+
+def compromise_cache_version() -> int:
+    """Current catalog version, for keys of results derived from it."""
+    # A missing version starts from the clock rather than 1, so an evicted
+    # version can never line up with results cached under an older one
+    return cache.get_or_set(_CACHE_VERSION_KEY, time.time_ns, None)
+
+
 def get_compromise_films(
     film_a: Film,
     film_b: Film,
     alpha: float = 0.5,
     limit: int = 20,
+) -> List[Dict]:
+    """
+    Cached front for _score_compromise_films().
+
+    Results are cached per (film_a, film_b, alpha, limit); A and B are not
+    interchangeable since the breakdown and reasons refer to each by name.
+    """
+    version = compromise_cache_version()
+    cache_key = (
+        f"compromise:{version}:{film_a.id}:{film_b.id}:{alpha!r}:{limit}"
+    )
+    return cache.get_or_set(
+        cache_key,
+        lambda: _score_compromise_films(film_a, film_b, alpha, limit),
+        COMPROMISE_CACHE_TIMEOUT,
+    )
+
+
+def _score_compromise_films(
+    film_a: Film,
+    film_b: Film,
+    alpha: float = 0.5,
+    limit: int = 20,
 ) -> List[Dict]:
     """
     Find films that "blend" two selected films using weighted Jaccard
     similarity.
 
     Args:
-        film_a: First reference film
-        film_b: Second reference film
+        film_a: First reference film (must already exist)
+        film_b: Second reference film (must already exist, distinct from A)
         alpha: Weight for film_a's similarity (0-1). film_b gets (1-alpha).
             Default 0.5.
         limit: Max number of results to return. Default 20.
@@ -161,66 +261,102 @@ def get_compromise_films(
         }
     """
 
-    # Prefetch all genres and keywords once
-    film_a = (
-        Film.objects.filter(id=film_a.id)
-        .prefetch_related("genres", "keywords")
-        .first()
-    )
-    film_b = (
-        Film.objects.filter(id=film_b.id)
-        .prefetch_related("genres", "keywords")
-        .first()
-    )
-
-    if not film_a or not film_b:
-        return []
-
-    # Extract IDs as sets for faster lookup
-    genres_a = set(film_a.genres.values_list("id", flat=True))
-    keywords_a = set(film_a.keywords.values_list("id", flat=True))
+    # One through-table query per relation covers both films, along with
+    # the names needed for explanations (only A/B tags can be shared).
+    # Genres are keyed by Genre.bit to line up with Film.genre_bitmask.
+    genre_mask_a = 0
+    genre_mask_b = 0
+    combined_genres: Set[int] = set()
+    genre_names: Dict[int, str] = {}
+    for film_id, genre_id, bit, name in FilmGenre.objects.filter(
+        film_id__in=[film_a.id, film_b.id]
+    ).values_list("film_id", "genre_id", "genre__bit", "genre__name"):
+        if film_id == film_a.id:
+            genre_mask_a |= 1 << bit
+        else:
+            genre_mask_b |= 1 << bit
+        combined_genres.add(genre_id)
+        genre_names[bit] = name
+
+    keywords_a: Set[int] = set()
+    keywords_b: Set[int] = set()
+    keyword_names: Dict[int, str] = {}
+    for film_id, keyword_id, name in FilmKeyword.objects.filter(
+        film_id__in=[film_a.id, film_b.id]
+    ).values_list("film_id", "keyword_id", "keyword__name"):
+        (keywords_a if film_id == film_a.id else keywords_b).add(keyword_id)
+        keyword_names[keyword_id] = name
+
+    # Build combined set of relevant keyword IDs (union of both films)
+    combined_keywords = keywords_a | keywords_b
 
-    genres_b = set(film_b.genres.values_list("id", flat=True))
-    keywords_b = set(film_b.keywords.values_list("id", flat=True))
+    # Only the combined keyword IDs can intersect, so they form the bit
+    # universe for keyword masks
+    keyword_bits = {kid: bit for bit, kid in enumerate(combined_keywords)}
 
-    # Build combined set of relevant IDs (union of both films)
-    combined_genres = genres_a | genres_b
-    combined_keywords = keywords_a | keywords_b
+    ref_genres_a = (genre_mask_a, genre_mask_a.bit_count())
+    ref_keywords_a = (_bitmask(keywords_a, keyword_bits), len(keywords_a))
+    ref_genres_b = (genre_mask_b, genre_mask_b.bit_count())
+    ref_keywords_b = (_bitmask(keywords_b, keyword_bits), len(keywords_b))
 
-    # Fetch candidates: must share ≥1 genre OR keyword with either film
-    candidates = Film.objects.exclude(
-        id__in=[film_a.id, film_b.id]
-    ).prefetch_related("genres", "keywords")
+    # Fetch candidates: must share ≥1 genre OR keyword with either film.
+    # Only the columns FilmCardLiteSerializer renders, plus the genre
+    # bitmask used for scoring, are loaded.
+    candidates = Film.objects.exclude(id__in=[film_a.id, film_b.id]).only(
+        *CANDIDATE_FIELDS, "genre_bitmask"
+    )
 
-    # Filter to films sharing at least one genre or keyword
+    # Filter to films sharing at least one genre or keyword. IN subqueries
+    # on the through tables avoid joining both and de-duplicating the rows.
     if combined_genres or combined_keywords:
         from django.db.models import Q
 
         candidates = candidates.filter(
-            Q(genres__id__in=combined_genres)
-            | Q(keywords__id__in=combined_keywords)
-        ).distinct()
+            Q(
+                id__in=FilmGenre.objects.filter(
+                    genre_id__in=combined_genres
+                ).values("film_id")
+            )
+            | Q(
+                id__in=FilmKeyword.objects.filter(
+                    keyword_id__in=combined_keywords
+                ).values("film_id")
+            )
+        )
     else:
         candidates = Film.objects.none()
 
-    # Fetch all candidates with prefetched relations
-    # (evaluate the queryset once)
+    # Evaluate the queryset once
     candidates = list(candidates)
+    candidate_ids = [candidate.id for candidate in candidates]
+
+    # Read keyword ids straight from the through table instead of
+    # prefetching Keyword instances that are never serialized
+    film_keywords: Dict = {}
+    for film_id, keyword_id in FilmKeyword.objects.filter(
+        film_id__in=candidate_ids
+    ).values_list("film_id", "keyword_id"):
+        film_keywords.setdefault(film_id, set()).add(keyword_id)
 
-    # Score each candidate
-    scored_results = []
+    # Score each candidate. Only the rounded score and the raw overlaps are
+    # kept per candidate; result dicts are built for the top `limit` alone.
+    scores: List[float] = []
+    overlaps: List[Tuple] = []
 
     for candidate in candidates:
-        # Use prefetched data (already loaded, no new queries)
-        candidate_genres = set(g.id for g in candidate.genres.all())
-        candidate_keywords = set(k.id for k in candidate.keywords.all())
+        candidate_keywords = film_keywords.get(candidate.id, set())
+
+        genre_mask = candidate.genre_bitmask
+        keyword_mask = _bitmask(candidate_keywords, keyword_bits)
+        cand_genres = (genre_mask, genre_mask.bit_count())
+        cand_keywords = (keyword_mask, len(candidate_keywords))
 
         # Compute similarity to each film
-        sim_a, breakdown_a = _compute_similarity_score(
-            candidate_genres, candidate_keywords, genres_a, keywords_a
+        sim_a, genre_sim_a, keyword_sim_a = _compute_similarity_score(
+            cand_genres, cand_keywords, ref_genres_a, ref_keywords_a
         )
-        sim_b, breakdown_b = _compute_similarity_score(
-            candidate_genres, candidate_keywords, genres_b, keywords_b
+        sim_b, genre_sim_b, keyword_sim_b = _compute_similarity_score(
+            cand_genres, cand_keywords, ref_genres_b, ref_keywords_b
         )
 
         # Weighted pair score
@@ -228,39 +364,64 @@ def get_compromise_films(
 
         # Bonuses for overlapping with both films
         bonus = 0.0
-        if (candidate_genres & genres_a) and (candidate_genres & genres_b):
+        if genre_mask & ref_genres_a[0] and genre_mask & ref_genres_b[0]:
             bonus += BOTH_GENRES_BONUS
-        if (candidate_keywords & keywords_a) and (
-            candidate_keywords & keywords_b
+        if keyword_mask & ref_keywords_a[0] and (
+            keyword_mask & ref_keywords_b[0]
         ):
             bonus += BOTH_KEYWORDS_BONUS
 
         final_score = min(pair_score + bonus, 1.0)  # Cap at 1.0
 
-        # Build match breakdown for response
-        match_breakdown = {
-            "genre_overlap_a": breakdown_a["genre_overlap"],
-            "keyword_overlap_a": breakdown_a["keyword_overlap"],
-            "genre_overlap_b": breakdown_b["genre_overlap"],
-            "keyword_overlap_b": breakdown_b["keyword_overlap"],
-            "bonus": bonus,
-        }
+        scores.append(round(final_score, 3))
+        overlaps.append(
+            (genre_sim_a, keyword_sim_a, genre_sim_b, keyword_sim_b, bonus)
+        )
 
-        # Build explanation strings using prefetched data
-        shared_genres_a = {
-            g.name for g in candidate.genres.all() if g.id in genres_a
-        }
-        shared_genres_b = {
-            g.name for g in candidate.genres.all() if g.id in genres_b
-        }
-        shared_keywords_a = {
-            k.name for k in candidate.keywords.all() if k.id in keywords_a
-        }
-        shared_keywords_b = {
-            k.name for k in candidate.keywords.all() if k.id in keywords_b
-        }
+    # Top `limit` by score; ties keep candidate order like a stable sort
+    top_indices = heapq.nlargest(
+        limit, range(len(scores)), key=scores.__getitem__
+    )
 
-        reasons = _build_explanation_strings(
+    top_results = []
+    for index in top_indices:
+        genre_sim_a, keyword_sim_a, genre_sim_b, keyword_sim_b, bonus = (
+            overlaps[index]
+        )
+        top_results.append(
+            {
+                "film": candidates[index],
+                "score": scores[index],
+                "match": {
+                    "genre_overlap_a": genre_sim_a,
+                    "keyword_overlap_a": keyword_sim_a,
+                    "genre_overlap_b": genre_sim_b,
+                    "keyword_overlap_b": keyword_sim_b,
+                    "bonus": bonus,
+                },
+            }
+        )
+
+    # Explanations are only built for the films that are returned
+    for result in top_results:
+        candidate = result["film"]
+        genre_mask = candidate.genre_bitmask
+        candidate_keywords = film_keywords.get(candidate.id, set())
+
+        shared_genres_a = frozenset(
+            genre_names[bit] for bit in _bits(genre_mask & genre_mask_a)
+        )
+        shared_genres_b = frozenset(
+            genre_names[bit] for bit in _bits(genre_mask & genre_mask_b)
+        )
+        shared_keywords_a = frozenset(
+            keyword_names[k] for k in candidate_keywords & keywords_a
+        )
+        shared_keywords_b = frozenset(
+            keyword_names[k] for k in candidate_keywords & keywords_b
+        )
+
+        result["reasons"] = _build_explanation_strings(
             candidate,
             shared_genres_a,
             shared_genres_b,
@@ -268,16 +429,4 @@ def get_compromise_films(
             shared_keywords_b,
         )
 
-        scored_results.append(
-            {
-                "film": candidate,
-                "score": round(final_score, 3),
-                "match": match_breakdown,
-                "reasons": reasons,
-            }
-        )
-
-    # Sort by score descending and apply limit
-    scored_results.sort(key=lambda x: x["score"], reverse=True)
-
-    return scored_results[:limit]
+    return top_results
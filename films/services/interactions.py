@@ -0,0 +1,180 @@
+"""
+Per-user interaction id sets and the preferences derived from them, used
+by the For You recommendations.
+
+Both only change when the user favourites, reviews or watchlists a film,
+so they are cached under a per-user version that the
+Favourite/Review/Watchlist signals bump.
+"""
+
+import time
+from typing import Dict, Set
+
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+
+from favourites.models import Favourite
+from films.models import Film, FilmGenre, FilmKeyword, FilmPerson
+from reviews.models import Review
+from watchlist.models import Watchlist
+
+# Short, as under the default per-process LocMemCache the signals don't
+# reach other workers; they serve stale sets until this runs out. It also
+# bounds the cached For You response, which shares the version.
+INTERACTIONS_CACHE_TIMEOUT = 60
+
+
+def user_cache_key(user_id, name) -> str:
+    """
+    Cache key for something derived from the user's interactions; it
+    changes whenever invalidate_user_interactions() runs.
+    """
+    # A missing version starts from the clock, as for compromise results
+    version = cache.get_or_set(f"foryou:{user_id}:version", time.time_ns, None)
+    return f"foryou:{user_id}:{version}:{name}"
+
+
+# Source tags for the rows of the combined interactions query
+_FAVOURITE, _REVIEW, _WATCHLIST = 1, 2, 3
+
+
+def _tagged_film_ids(queryset, tag):
+    # Every column is an annotation so the SELECT lists of the unioned
+    # queries line up in the same order
+    return (
+        queryset.order_by()
+        .annotate(
+            tag=Value(tag, output_field=IntegerField()),
+            interacted_film=F("film_id"),
+            score=(
+                F("rating")
+                if tag == _REVIEW
+                else Value(0, output_field=IntegerField())
+            ),
+        )
+        .values_list("tag", "interacted_film", "score")
+    )
+
+
+def _load_interactions(user_id) -> Dict[str, Set]:
+    favourites = Favourite.objects.filter(user_id=user_id)
+    reviews = Review.objects.filter(user_id=user_id)
+
+    # One UNION ALL round-trip for the favourite, review and watchlist rows
+    rows = _tagged_film_ids(favourites, _FAVOURITE).union(
+        _tagged_film_ids(reviews, _REVIEW),
+        _tagged_film_ids(
+            Watchlist.objects.filter(user_id=user_id), _WATCHLIST
+        ),
+        all=True,
+    )
+
+    interactions = {
+        "favourited": set(),
+        "reviewed": set(),
+        "highly_rated": set(),
+        "watchlist": set(),
+    }
+    for tag, film_id, rating in rows:
+        if tag == _FAVOURITE:
+            interactions["favourited"].add(film_id)
+        elif tag == _WATCHLIST:
+            interactions["watchlist"].add(film_id)
+        else:
+            interactions["reviewed"].add(film_id)
+            if rating >= 7:
+                interactions["highly_rated"].add(film_id)
+
+    # Genres of favourited and highly-rated (7+) films; both id lists go
+    # in as subqueries rather than being fetched first
+    interactions["liked_genres"] = set(
+        FilmGenre.objects.filter(
+            Q(film_id__in=favourites.values("film_id"))
+            | Q(film_id__in=reviews.filter(rating__gte=7).values("film_id"))
+        ).values_list("genre_id", flat=True)
+    )
+    return interactions
+
+
+def get_user_interactions(user_id) -> Dict[str, Set]:
+    """
+    Return the user's favourited, reviewed, highly_rated and watchlist
+    film id sets plus the liked_genres of their favourite and 7+ films.
+    """
+    return cache.get_or_set(
+        user_cache_key(user_id, "interactions"),
+        lambda: _load_interactions(user_id),
+        INTERACTIONS_CACHE_TIMEOUT,
+    )
+
+
+def _average_ratings(user_id, related, **filters) -> Dict:
+    # Average rating the user gave films per related id, in one GROUP BY
+    rows = (
+        Review.objects.filter(
+            user_id=user_id, **{f"{related}__isnull": False}, **filters
+        )
+        .order_by()
+        .values(related)
+        .annotate(total=Sum("rating"), count=Count("id"))
+    )
+    return {row[related]: row["total"] / row["count"] for row in rows}
+
+
+def _load_preferences(user_id) -> Dict:
+    interactions = get_user_interactions(user_id)
+    liked_film_ids = interactions["favourited"] | interactions["highly_rated"]
+
+    liked_years = list(
+        Film.objects.filter(id__in=liked_film_ids).values_list(
+            "year", flat=True
+        )
+    )
+
+    return {
+        # people/keywords of favourited and 7+ films, read straight from
+        # the through tables
+        "liked_directors": set(
+            FilmPerson.objects.filter(
+                film_id__in=liked_film_ids, role=FilmPerson.Role.DIRECTOR
+            ).values_list("person_id", flat=True)
+        ),
+        "liked_keywords": set(
+            FilmKeyword.objects.filter(film_id__in=liked_film_ids).values_list(
+                "keyword_id", flat=True
+            )
+        ),
+        "avg_year": (
+            sum(liked_years) / len(liked_years) if liked_years else None
+        ),
+        "genre_affinity": _average_ratings(user_id, "film__genres"),
+        "director_affinity": _average_ratings(
+            user_id,
+            "film__film_people__person",
+            film__film_people__role=FilmPerson.Role.DIRECTOR,
+        ),
+        "keyword_affinity": _average_ratings(user_id, "film__keywords"),
+    }
+
+
+def get_user_preferences(user_id) -> Dict:
+    """
+    Return what For You derives from the user's interactions: the
+    liked_directors and liked_keywords id sets, the avg_year of liked
+    films, and genre/director/keyword_affinity maps of id to the user's
+    average rating.
+    """
+    return cache.get_or_set(
+        user_cache_key(user_id, "preferences"),
+        lambda: _load_preferences(user_id),
+        INTERACTIONS_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_user_interactions(user_id) -> None:
+    """Expire the cached sets after the user's interactions change."""
+    try:
+        cache.incr(f"foryou:{user_id}:version")
+    except ValueError:
+        # No version stored yet (or it was evicted): start a fresh one
+        cache.set(f"foryou:{user_id}:version", time.time_ns(), None)
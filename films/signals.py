@@ -0,0 +1,42 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Film, FilmGenre
+from .services.compromise import invalidate_compromise_cache
+
+
+@receiver(m2m_changed, sender=Film.genres.through)
+def sync_genre_bitmask(sender, instance, action, reverse, pk_set, **kwargs):
+    # FilmGenre rows written directly (the TMDB sync's bulk writes, the
+    # FilmGenre admin) bypass this signal and set genre_bitmask themselves
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            Film.update_genre_bitmasks([instance.pk])
+        return
+
+    # genre.films.add()/remove()/clear(): pk_set holds film ids, except on
+    # clear, where the affected films have to be read up front
+    if action == "pre_clear":
+        instance._cleared_film_ids = list(
+            FilmGenre.objects.filter(genre=instance).values_list(
+                "film_id", flat=True
+            )
+        )
+    elif action == "post_clear":
+        Film.update_genre_bitmasks(instance._cleared_film_ids)
+    elif action in ("post_add", "post_remove"):
+        Film.update_genre_bitmasks(pk_set)
+
+
+@receiver(post_save, sender=Film)
+@receiver(post_delete, sender=Film)
+@receiver(m2m_changed, sender=Film.genres.through)
+@receiver(m2m_changed, sender=Film.keywords.through)
+@receiver(m2m_changed, sender=Film.people.through)
+def expire_compromise_results(sender, **kwargs):
+    # Blend rankings share this version and also score people. Link rows
+    # written directly (TMDB sync, link admins) expire it themselves, so
+    # per-row signals on the through models are not needed
+    # m2m_changed fires before and after each change; once is enough
+    if kwargs.get("action", "post_").startswith("post_"):
+        invalidate_compromise_cache()
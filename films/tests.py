@@ -1,16 +1,31 @@
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
 
-from .models import Film, Genre, Keyword
+from favourites.models import Favourite
+from reviews.models import Review
+from watchlist.models import Watchlist
+from .models import (
+    Film,
+    FilmGenre,
+    FilmKeyword,
+    FilmPerson,
+    Genre,
+    Keyword,
+    Person,
+)
+from .services.compromise import compromise_cache_version
+from .serializers import FilmSerializer
 
 User = get_user_model()
 
 
 class FilmAPITests(APITestCase):
-    def setUp(self):
-        self.film = Film.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.film = Film.objects.create(
             title="Test Film",
             year=2024,
             tmdb_id=123,
@@ -20,6 +35,10 @@ class FilmAPITests(APITestCase):
             popularity=10.0,
         )
 
+    def setUp(self):
+        # Anonymous film lists are cached across requests
+        cache.clear()
+
     def test_list_films_returns_200_and_includes_film(self):
         url = reverse("film-list")  # /api/films/
         response = self.client.get(url)
@@ -29,6 +48,91 @@ class FilmAPITests(APITestCase):
         titles = [item["title"] for item in response.data]
         self.assertIn("Test Film", titles)
 
+    def test_list_films_query_count_does_not_grow_with_films(self):
+        for i in range(3):
+            Film.objects.create(title=f"Extra {i}", year=2020, tmdb_id=900 + i)
+
+        # films + one prefetch each for genres, keywords and people
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("film-list"))
+
+        self.assertEqual(len(response.data), 4)
+
+    def test_anonymous_list_is_served_from_cache(self):
+        url = reverse("film-list")
+        first = self.client.get(url, {"year": 2024})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {"year": 2024})
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_list_answers_matching_etag_with_304(self):
+        url = reverse("film-list")
+        first = self.client.get(url)
+        self.assertTrue(first.has_header("ETag"))
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second.content, b"")
+
+        # Signed-in responses carry per-user flags: private, short-lived
+        user = User.objects.create_user(username="etag", password="pass12345")
+        self.client.force_authenticate(user=user)
+        for path in (url, reverse("film-detail", args=[self.film.id])):
+            response = self.client.get(path)
+            self.assertTrue(response.has_header("ETag"))
+            self.assertIn("private", response["Cache-Control"])
+            self.assertIn("max-age=60", response["Cache-Control"])
+
+    def test_list_flags_and_filters_user_favourites(self):
+        user = User.objects.create_user(username="fan", password="pass12345")
+        other = Film.objects.create(title="Other Film", year=2020, tmdb_id=99)
+        Favourite.objects.create(user=user, film=self.film)
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(reverse("film-list"))
+        flags = {
+            item["title"]: item["is_favourited"] for item in response.data
+        }
+        self.assertEqual(flags, {"Test Film": True, other.title: False})
+
+        response = self.client.get(
+            reverse("film-list"), {"favourited": "true"}
+        )
+        self.assertEqual(
+            [item["title"] for item in response.data], ["Test Film"]
+        )
+
+    def test_blend_returns_fit_scores(self):
+        genre = Genre.objects.create(id=1, tmdb_id=1, name="Drama", bit=0)
+        second = Film.objects.create(title="Second", year=2020, tmdb_id=2)
+        match = Film.objects.create(title="Match", year=2021, tmdb_id=3)
+        for film in (self.film, second, match):
+            film.genres.add(genre)
+        user = User.objects.create_user(username="blend", password="pass123")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(
+            reverse("film-blend"),
+            {"film_a": self.film.id, "film_b": second.id},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([item["title"] for item in results], ["Match"])
+        self.assertEqual(results[0]["fit_score"], 100)
+
+    def test_api_queryset_loads_every_serialized_column(self):
+        film = Film.api_queryset().get(pk=self.film.pk)
+
+        # a deferred column would cost one query per film when serialized
+        context = {"favourite_film_ids": set(), "watchlist_film_ids": set()}
+        with self.assertNumQueries(0):
+            FilmSerializer(film, context=context).data
+
     def test_retrieve_single_film(self):
         url = reverse("film-detail", args=[self.film.id])  # /api/films/<id>/
         response = self.client.get(url)
@@ -45,104 +149,153 @@ class FilmAPITests(APITestCase):
 class CompromiseAPITests(APITestCase):
     """Tests for the /api/compromise/ endpoint (Blend Mode)."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create test user, films, genres, and keywords."""
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username="testuser",
             email="test@example.com",
             password="testpass123",
         )
 
-        # Create genres
-        self.action = Genre.objects.create(id=1, name="Action", tmdb_id=28)
-        self.thriller = Genre.objects.create(id=2, name="Thriller", tmdb_id=53)
-        self.drama = Genre.objects.create(id=3, name="Drama", tmdb_id=18)
-        self.scifi = Genre.objects.create(
-            id=4, name="Science Fiction", tmdb_id=878
+        # Create genres (bulk_create skips Genre.save, so set bits here)
+        cls.action, cls.thriller, cls.drama, cls.scifi = (
+            Genre.objects.bulk_create(
+                [
+                    Genre(id=1, name="Action", tmdb_id=28, bit=0),
+                    Genre(id=2, name="Thriller", tmdb_id=53, bit=1),
+                    Genre(id=3, name="Drama", tmdb_id=18, bit=2),
+                    Genre(id=4, name="Science Fiction", tmdb_id=878, bit=3),
+                ]
+            )
         )
 
         # Create keywords
-        self.heist = Keyword.objects.create(id=1, name="heist", tmdb_id=1001)
-        self.spy = Keyword.objects.create(id=2, name="spy", tmdb_id=1002)
-        self.dream = Keyword.objects.create(id=3, name="dream", tmdb_id=1003)
-        self.robot = Keyword.objects.create(id=4, name="robot", tmdb_id=1004)
-
-        # Film A: Action + Thriller + Heist + Dream
-        self.film_a = Film.objects.create(
-            title="Ocean's Eleven",
-            year=2001,
-            tmdb_id=401,
-            poster_path="/oceansm.jpg",
-            runtime=116,
-            critic_score=8.0,
-            popularity=100.0,
-        )
-        self.film_a.genres.set([self.action, self.thriller])
-        self.film_a.keywords.set([self.heist, self.dream])
-
-        # Film B: Thriller + SciFi + Spy + Robot
-        self.film_b = Film.objects.create(
-            title="Inception",
-            year=2010,
-            tmdb_id=402,
-            poster_path="/inception.jpg",
-            runtime=148,
-            critic_score=8.8,
-            popularity=120.0,
-        )
-        self.film_b.genres.set([self.thriller, self.scifi])
-        self.film_b.keywords.set([self.spy, self.dream])
-
-        # Candidate 1: Action + Thriller + Heist + Spy (overlaps with both)
-        self.candidate_1 = Film.objects.create(
-            title="Mission: Impossible",
-            year=2006,
-            tmdb_id=403,
-            poster_path="/mi.jpg",
-            runtime=125,
-            critic_score=7.5,
-            popularity=90.0,
-        )
-        self.candidate_1.genres.set([self.action, self.thriller])
-        self.candidate_1.keywords.set([self.heist, self.spy])
-
-        # Candidate 2: Action + Heist (overlaps with A only)
-        self.candidate_2 = Film.objects.create(
-            title="Baby Driver",
-            year=2017,
-            tmdb_id=404,
-            poster_path="/baby.jpg",
-            runtime=113,
-            critic_score=7.8,
-            popularity=80.0,
-        )
-        self.candidate_2.genres.set([self.action])
-        self.candidate_2.keywords.set([self.heist])
-
-        # Candidate 3: SciFi + Dream (overlaps with B only)
-        self.candidate_3 = Film.objects.create(
-            title="The Matrix",
-            year=1999,
-            tmdb_id=405,
-            poster_path="/matrix.jpg",
-            runtime=136,
-            critic_score=8.7,
-            popularity=110.0,
-        )
-        self.candidate_3.genres.set([self.scifi])
-        self.candidate_3.keywords.set([self.dream, self.robot])
-
-        # Candidate 4: Drama (no overlap)
-        self.candidate_4 = Film.objects.create(
-            title="Shawshank Redemption",
-            year=1994,
-            tmdb_id=406,
-            poster_path="/shawshank.jpg",
-            runtime=142,
-            critic_score=9.3,
-            popularity=130.0,
-        )
-        self.candidate_4.genres.set([self.drama])
+        cls.heist, cls.spy, cls.dream, cls.robot = Keyword.objects.bulk_create(
+            [
+                Keyword(id=1, name="heist", tmdb_id=1001),
+                Keyword(id=2, name="spy", tmdb_id=1002),
+                Keyword(id=3, name="dream", tmdb_id=1003),
+                Keyword(id=4, name="robot", tmdb_id=1004),
+            ]
+        )
+
+        # Create films; UUID keys are set client-side, so one bulk insert
+        # works on every backend
+        (
+            cls.film_a,
+            cls.film_b,
+            cls.candidate_1,
+            cls.candidate_2,
+            cls.candidate_3,
+            cls.candidate_4,
+        ) = Film.objects.bulk_create(
+            [
+                # Film A: Action + Thriller + Heist + Dream
+                Film(
+                    title="Ocean's Eleven",
+                    year=2001,
+                    tmdb_id=401,
+                    poster_path="/oceansm.jpg",
+                    runtime=116,
+                    critic_score=8.0,
+                    popularity=100.0,
+                ),
+                # Film B: Thriller + SciFi + Spy + Robot
+                Film(
+                    title="Inception",
+                    year=2010,
+                    tmdb_id=402,
+                    poster_path="/inception.jpg",
+                    runtime=148,
+                    critic_score=8.8,
+                    popularity=120.0,
+                ),
+                # Candidate 1: Action + Thriller + Heist + Spy (both films)
+                Film(
+                    title="Mission: Impossible",
+                    year=2006,
+                    tmdb_id=403,
+                    poster_path="/mi.jpg",
+                    runtime=125,
+                    critic_score=7.5,
+                    popularity=90.0,
+                ),
+                # Candidate 2: Action + Heist (overlaps with A only)
+                Film(
+                    title="Baby Driver",
+                    year=2017,
+                    tmdb_id=404,
+                    poster_path="/baby.jpg",
+                    runtime=113,
+                    critic_score=7.8,
+                    popularity=80.0,
+                ),
+                # Candidate 3: SciFi + Dream (overlaps with B only)
+                Film(
+                    title="The Matrix",
+                    year=1999,
+                    tmdb_id=405,
+                    poster_path="/matrix.jpg",
+                    runtime=136,
+                    critic_score=8.7,
+                    popularity=110.0,
+                ),
+                # Candidate 4: Drama (no overlap)
+                Film(
+                    title="Shawshank Redemption",
+                    year=1994,
+                    tmdb_id=406,
+                    poster_path="/shawshank.jpg",
+                    runtime=142,
+                    critic_score=9.3,
+                    popularity=130.0,
+                ),
+            ]
+        )
+
+        # Link genres/keywords with one insert per through table; bulk
+        # inserts skip the m2m signal, so refresh the genre bitmasks after
+        FilmGenre.objects.bulk_create(
+            [
+                FilmGenre(film=cls.film_a, genre=cls.action),
+                FilmGenre(film=cls.film_a, genre=cls.thriller),
+                FilmGenre(film=cls.film_b, genre=cls.thriller),
+                FilmGenre(film=cls.film_b, genre=cls.scifi),
+                FilmGenre(film=cls.candidate_1, genre=cls.action),
+                FilmGenre(film=cls.candidate_1, genre=cls.thriller),
+                FilmGenre(film=cls.candidate_2, genre=cls.action),
+                FilmGenre(film=cls.candidate_3, genre=cls.scifi),
+                FilmGenre(film=cls.candidate_4, genre=cls.drama),
+            ]
+        )
+        FilmKeyword.objects.bulk_create(
+            [
+                FilmKeyword(film=cls.film_a, keyword=cls.heist),
+                FilmKeyword(film=cls.film_a, keyword=cls.dream),
+                FilmKeyword(film=cls.film_b, keyword=cls.spy),
+                FilmKeyword(film=cls.film_b, keyword=cls.dream),
+                FilmKeyword(film=cls.candidate_1, keyword=cls.heist),
+                FilmKeyword(film=cls.candidate_1, keyword=cls.spy),
+                FilmKeyword(film=cls.candidate_2, keyword=cls.heist),
+                FilmKeyword(film=cls.candidate_3, keyword=cls.dream),
+                FilmKeyword(film=cls.candidate_3, keyword=cls.robot),
+            ]
+        )
+        Film.update_genre_bitmasks(
+            [
+                cls.film_a.id,
+                cls.film_b.id,
+                cls.candidate_1.id,
+                cls.candidate_2.id,
+                cls.candidate_3.id,
+                cls.candidate_4.id,
+            ]
+        )
+
+    def setUp(self):
+        # Cached results outlive the per-test rollback of the shared films
+        cache.clear()
 
     def test_compromise_requires_authentication(self):
         """Unauthenticated users should get 401."""
@@ -263,6 +416,28 @@ class CompromiseAPITests(APITestCase):
         self.assertIn("meta", response.data)
         self.assertIn("results", response.data)
 
+    def test_compromise_json_request_matches_form_request(self):
+        """JSON bodies (validated without the serializer) behave the same."""
+        self.client.force_authenticate(user=self.user)
+        url = reverse("film-compromise")
+        payload = {
+            "film_a_id": str(self.film_a.id),
+            "film_b_id": str(self.film_b.id),
+            "alpha": 1,
+            "limit": 2,
+        }
+        form_response = self.client.post(url, payload)
+        json_response = self.client.post(url, payload, format="json")
+
+        self.assertEqual(json_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json_response.data, form_response.data)
+        self.assertEqual(json_response.data["meta"]["alpha"], 1.0)
+
+        payload["limit"] = 51
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("limit", response.data)
+
     def test_compromise_response_structure(self):
         """Response should have correct structure."""
         self.client.force_authenticate(user=self.user)
@@ -450,3 +625,249 @@ class CompromiseAPITests(APITestCase):
         # Both should have results, but potentially different ordering
         self.assertGreater(len(results_a05), 0)
         self.assertGreater(len(results_a01), 0)
+
+    def test_compromise_cache_expires_on_genre_change(self):
+        """Cached results are dropped when a film's genres change."""
+        self.client.force_authenticate(user=self.user)
+        url = reverse("film-compromise")
+        payload = {
+            "film_a_id": str(self.film_a.id),
+            "film_b_id": str(self.film_b.id),
+        }
+
+        response = self.client.post(url, payload)
+        ids = [r["film"]["id"] for r in response.data["results"]]
+        self.assertNotIn(str(self.candidate_4.id), ids)
+
+        # Shawshank now shares genres with both films
+        self.candidate_4.genres.set([self.action, self.thriller])
+
+        response = self.client.post(url, payload)
+        ids = [r["film"]["id"] for r in response.data["results"]]
+        self.assertIn(str(self.candidate_4.id), ids)
+
+    def test_compromise_cache_expires_on_link_admin_changes(self):
+        """Link rows added or deleted in the admin expire cached results."""
+        self.client.force_authenticate(user=self.user)
+        self.client.force_login(
+            User.objects.create_superuser(
+                username="admin", password="pass12345"
+            )
+        )
+        url = reverse("film-compromise")
+        payload = {
+            "film_a_id": str(self.film_a.id),
+            "film_b_id": str(self.film_b.id),
+        }
+
+        response = self.client.post(url, payload)
+        ids = [r["film"]["id"] for r in response.data["results"]]
+        self.assertNotIn(str(self.candidate_4.id), ids)
+
+        self.client.post(
+            reverse("admin:films_filmgenre_add"),
+            {"film": self.candidate_4.pk, "genre": self.thriller.pk},
+        )
+        response = self.client.post(url, payload)
+        ids = [r["film"]["id"] for r in response.data["results"]]
+        self.assertIn(str(self.candidate_4.id), ids)
+
+        director = Person.objects.create(id=1, tmdb_id=1, name="Director")
+        for model, data in (
+            (FilmKeyword, {"keyword": self.spy.pk}),
+            (
+                FilmPerson,
+                {"person": director.pk, "role": FilmPerson.Role.DIRECTOR},
+            ),
+        ):
+            name = model._meta.model_name
+            version = compromise_cache_version()
+            response = self.client.post(
+                reverse(f"admin:films_{name}_add"),
+                {"film": self.candidate_4.pk, **data},
+            )
+            self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+            self.assertNotEqual(compromise_cache_version(), version)
+
+            # the changelist's bulk delete action
+            version = compromise_cache_version()
+            row = model.objects.get(film=self.candidate_4, **data)
+            self.client.post(
+                reverse(f"admin:films_{name}_changelist"),
+                {
+                    "action": "delete_selected",
+                    "_selected_action": [row.pk],
+                    "post": "yes",
+                },
+            )
+            self.assertFalse(model.objects.filter(pk=row.pk).exists())
+            self.assertNotEqual(compromise_cache_version(), version)
+
+    def test_genre_bitmask_follows_genre_changes(self):
+        """Film.genre_bitmask tracks genres set/removed via the M2M."""
+        self.candidate_1.refresh_from_db()
+        self.assertEqual(
+            self.candidate_1.genre_bitmask,
+            (1 << self.action.bit) | (1 << self.thriller.bit),
+        )
+
+        self.candidate_1.genres.remove(self.action)
+        self.candidate_1.refresh_from_db()
+        self.assertEqual(
+            self.candidate_1.genre_bitmask, 1 << self.thriller.bit
+        )
+
+        self.thriller.films.clear()
+        self.candidate_1.refresh_from_db()
+        self.assertEqual(self.candidate_1.genre_bitmask, 0)
+
+    def test_genre_bitmask_follows_filmgenre_admin(self):
+        """FilmGenre rows added or deleted in the admin update the bitmask."""
+        admin_user = User.objects.create_superuser(
+            username="admin", password="pass12345"
+        )
+        self.client.force_login(admin_user)
+
+        response = self.client.post(
+            reverse("admin:films_filmgenre_add"),
+            {"film": self.candidate_4.pk, "genre": self.scifi.pk},
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.candidate_4.refresh_from_db()
+        self.assertEqual(
+            self.candidate_4.genre_bitmask,
+            (1 << self.drama.bit) | (1 << self.scifi.bit),
+        )
+
+        link = FilmGenre.objects.get(film=self.candidate_4, genre=self.scifi)
+        response = self.client.post(
+            reverse("admin:films_filmgenre_delete", args=[link.pk]),
+            {"post": "yes"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.candidate_4.refresh_from_db()
+        self.assertEqual(self.candidate_4.genre_bitmask, 1 << self.drama.bit)
+
+
+class ForYouAPITests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="foryou", password="pass12345"
+        )
+        cls.action, cls.drama, cls.scifi, cls.horror = (
+            Genre.objects.bulk_create(
+                [
+                    Genre(id=1, name="Action", tmdb_id=28, bit=0),
+                    Genre(id=2, name="Drama", tmdb_id=18, bit=1),
+                    Genre(id=3, name="Science Fiction", tmdb_id=878, bit=2),
+                    Genre(id=4, name="Horror", tmdb_id=27, bit=3),
+                ]
+            )
+        )
+        cls.heist = Keyword.objects.create(id=1, name="heist", tmdb_id=1001)
+        cls.director = Person.objects.create(id=1, tmdb_id=1, name="Mann")
+
+        def film(title, tmdb_id, **kwargs):
+            return Film.objects.create(
+                title=title, year=2000, tmdb_id=tmdb_id, **kwargs
+            )
+
+        # What the user already favourited or reviewed
+        cls.favourite = film("Heat", 1)
+        cls.loved = film("Collateral", 2)
+        cls.disliked = film("Sunshine", 3)
+        # Candidates
+        cls.best = film(
+            "Thief", 4, vote_count=3000, critic_score=8.8, popularity=10
+        )
+        cls.genre_only = film("Ronin", 5, vote_count=500)
+        cls.watchlisted = film("Moon", 6)
+        cls.unrelated = film("Hereditary", 7, vote_count=5000)
+
+        for film_obj, genres in (
+            (cls.favourite, [cls.action, cls.drama]),
+            (cls.loved, [cls.action]),
+            (cls.disliked, [cls.scifi]),
+            (cls.best, [cls.action, cls.drama]),
+            (cls.genre_only, [cls.action]),
+            (cls.watchlisted, [cls.scifi]),
+            (cls.unrelated, [cls.horror]),
+        ):
+            film_obj.genres.set(genres)
+        cls.favourite.keywords.add(cls.heist)
+        cls.best.keywords.add(cls.heist)
+        FilmPerson.objects.bulk_create(
+            FilmPerson(
+                film=film_obj,
+                person=cls.director,
+                role=FilmPerson.Role.DIRECTOR,
+            )
+            for film_obj in (cls.favourite, cls.best)
+        )
+
+        Favourite.objects.create(user=cls.user, film=cls.favourite)
+        Review.objects.create(user=cls.user, film=cls.loved, rating=9)
+        Review.objects.create(user=cls.user, film=cls.disliked, rating=4)
+        Watchlist.objects.create(user=cls.user, film=cls.watchlisted)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_for_you_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse("film-for-you"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_for_you_ranks_unseen_matches(self):
+        """Scored, explained picks that skip favourited/reviewed films."""
+        url = reverse("film-for-you")
+        # profile, interaction and preference lookups, the candidates and
+        # their prefetches; none of it grows with the number of candidates
+        with self.assertNumQueries(14):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {r["title"]: r for r in response.data}
+        self.assertEqual(
+            [r["title"] for r in response.data], ["Thief", "Ronin", "Moon"]
+        )
+        for title in ("Heat", "Collateral", "Sunshine", "Hereditary"):
+            self.assertNotIn(title, results)
+
+        scores = [r["match_score"] for r in response.data]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(results["Thief"]["match_score"], 85)
+
+        self.assertEqual(
+            results["Thief"]["reasons"],
+            ["Matches your Action, Drama preferences", "Matches your themes"],
+        )
+        self.assertEqual(
+            results["Ronin"]["reasons"], ["Matches your Action preference"]
+        )
+        self.assertEqual(results["Moon"]["reasons"], ["On your watchlist"])
+
+        for title, result in results.items():
+            self.assertFalse(result["is_favourited"])
+            self.assertEqual(result["in_watchlist"], title == "Moon")
+
+        # Repeat requests are served from the versioned response cache
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.data, response.data)
+
+    def test_for_you_expires_when_interactions_change(self):
+        """A new favourite or watchlist entry is reflected straight away."""
+        url = reverse("film-for-you")
+        first = self.client.get(url)
+        self.assertIn("Ronin", [r["title"] for r in first.data])
+
+        Favourite.objects.create(user=self.user, film=self.genre_only)
+        Watchlist.objects.create(user=self.user, film=self.best)
+
+        second = self.client.get(url)
+        results = {r["title"]: r for r in second.data}
+        self.assertNotIn("Ronin", results)
+        self.assertTrue(results["Thief"]["in_watchlist"])
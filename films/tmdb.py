@@ -1,30 +1,110 @@
+import functools
+import shelve
+import threading
+import time
+from urllib.parse import urlencode
+
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 
+# Seconds to wait for TMDB to connect/respond before failing the call, so a
+# stalled connection cannot hold a pooled session slot indefinitely
+TMDB_TIMEOUT = 10
+
+# Shared session so TCP/TLS connections are reused across calls; the pool
+# is sized for the seed command fetching several films concurrently
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=16))
+
+# TMDB recomputes popularity and discover rankings slowly, so list pages
+# are reused from the disk cache for this many seconds
+TMDB_LIST_CACHE_TIMEOUT = 60 * 60
+
+# shelve files are not safe for concurrent access from several threads
+_disk_cache_lock = threading.Lock()
+
 
 def tmdb_get(path, params=None):
-    if params is None:
-        params = {}
-    params["api_key"] = settings.TMDB_API_KEY
-    response = requests.get(f"{TMDB_BASE_URL}{path}", params=params)
+    params = {**(params or {}), "api_key": settings.TMDB_API_KEY}
+    response = _session.get(
+        f"{TMDB_BASE_URL}{path}", params=params, timeout=TMDB_TIMEOUT
+    )
     response.raise_for_status()
     return response.json()
 
 
+def _disk_get(key, ttl):
+    """Return the TMDB_CACHE_PATH entry for key if under ttl seconds old."""
+    with _disk_cache_lock, shelve.open(str(settings.TMDB_CACHE_PATH)) as db:
+        entry = db.get(key)
+    if entry and time.time() - entry["synced_at"] < ttl:
+        return entry["data"]
+    return None
+
+
+def _disk_set(key, data):
+    with _disk_cache_lock, shelve.open(str(settings.TMDB_CACHE_PATH)) as db:
+        db[key] = {"synced_at": time.time(), "data": data}
+
+
+def _cached_list_get(path, params):
+    """
+    tmdb_get() for a list endpoint, cached per path and params in
+    TMDB_CACHE_PATH. The seed runs as a one-shot command, so Django's
+    per-process cache would never be hit again.
+    """
+    if not settings.TMDB_CACHE_PATH:
+        return tmdb_get(path, params)
+
+    key = f"list:{path}?{urlencode(sorted(params.items()))}"
+    data = _disk_get(key, TMDB_LIST_CACHE_TIMEOUT)
+    if data is None:
+        data = tmdb_get(path, params)
+        _disk_set(key, data)
+    return data
+
+
 def fetch_popular_movies(page=1):
-    return tmdb_get("/movie/popular", {"page": page})
+    return _cached_list_get("/movie/popular", {"page": page})
+
+
+def _disk_cached(fetch):
+    """
+    Cache a per-film fetcher in memory and in TMDB_CACHE_PATH (a shelve
+    file) so re-running the seed does not re-fetch films it already saw.
+    Entries older than TMDB_CACHE_TTL seconds are fetched again.
+    """
+
+    @functools.lru_cache(maxsize=4096)
+    @functools.wraps(fetch)
+    def wrapper(tmdb_id):
+        if not settings.TMDB_CACHE_PATH:
+            return fetch(tmdb_id)
+
+        key = f"{fetch.__name__}:{tmdb_id}"
+        data = _disk_get(key, settings.TMDB_CACHE_TTL)
+        if data is None:
+            data = fetch(tmdb_id)
+            _disk_set(key, data)
+        return data
+
+    return wrapper
 
 
+@_disk_cached
 def fetch_movie_details(tmdb_id):
     return tmdb_get(f"/movie/{tmdb_id}")
 
 
+@_disk_cached
 def fetch_movie_keywords(tmdb_id):
     return tmdb_get(f"/movie/{tmdb_id}/keywords")
 
 
+@_disk_cached
 def fetch_movie_credits(tmdb_id):
     return tmdb_get(f"/movie/{tmdb_id}/credits")
 
@@ -35,4 +115,4 @@ def fetch_discover_movies(page=1, **params):
     Accepts flexible filters like year ranges, genres, sort modes, etc.
     """
     params["page"] = page
-    return tmdb_get("/discover/movie", params)
+    return _cached_list_get("/discover/movie", params)
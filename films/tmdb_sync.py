@@ -0,0 +1,285 @@
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from films.tmdb import (
+    fetch_movie_details,
+    fetch_movie_keywords,
+    fetch_movie_credits,
+)
+
+from films.services.compromise import invalidate_compromise_cache
+from films.models import (
+    Film,
+    Genre,
+    Keyword,
+    Person,
+    FilmGenre,
+    FilmKeyword,
+    FilmPerson,
+)
+
+# Fields refreshed on an existing film when TMDB is re-synced
+FILM_UPDATE_FIELDS = [
+    "title",
+    "year",
+    "overview",
+    "poster_path",
+    "runtime",
+    "critic_score",
+    "popularity",
+    "vote_count",
+    "genre_bitmask",
+    "last_synced_at",
+    "updated_at",
+]
+
+# Leading year of a TMDB release_date such as "1999-03-31"
+_YEAR_RE = re.compile(r"^(\d{4})")
+
+
+def fetch_movie_payloads(tmdb_id):
+    """Fetch the details, keywords and credits payloads for one film."""
+    return (
+        fetch_movie_details(tmdb_id),
+        fetch_movie_keywords(tmdb_id),
+        fetch_movie_credits(tmdb_id),
+    )
+
+
+def load_related_caches():
+    """
+    Load every known genre and keyword keyed by TMDB id.
+
+    TMDB genres/keywords repeat across films and both tables stay small, so
+    keep every row in memory instead of a get_or_create per film.
+    """
+    return (
+        {g.tmdb_id: g for g in Genre.objects.all()},
+        {k.tmdb_id: k for k in Keyword.objects.all()},
+    )
+
+
+def build_movie(
+    tmdb_id: int,
+    teaser: dict,
+    details: dict,
+    keywords_payload: dict,
+    credits: dict,
+    existing: Film = None,
+):
+    """
+    Turn one movie's TMDB payloads into an unsaved Film plus its related
+    genres, keywords and people. Returns None for films without a year.
+
+    Pass the already saved Film for tmdb_id as `existing` so the built
+    instance reuses its primary key.
+    """
+    title = teaser.get("title") or teaser.get("name") or "Untitled"
+    release_date = teaser.get("release_date") or ""
+    m = _YEAR_RE.match(release_date)
+    year = int(m.group(1)) if m else None
+
+    poster_path = teaser.get("poster_path") or ""
+    critic_score = teaser.get("vote_average") or 0.0
+    popularity = teaser.get("popularity") or 0.0
+    vote_count = teaser.get("vote_count") or 0
+
+    runtime = details.get("runtime")
+    overview = details.get("overview")
+
+    # If year missing in teaser, try from details
+    if not year:
+        m = _YEAR_RE.match(details.get("release_date") or "")
+        year = int(m.group(1)) if m else None
+
+    # Your model requires year (PositiveIntegerField)
+    if not year:
+        return None  # skip films without a year
+
+    film = Film(
+        tmdb_id=tmdb_id,
+        title=title,
+        year=year,
+        overview=overview,
+        poster_path=poster_path,
+        runtime=runtime,
+        critic_score=critic_score,
+        popularity=popularity,
+        vote_count=vote_count,
+        last_synced_at=timezone.now(),
+    )
+    if existing is not None:
+        # The upsert keeps the stored primary key, so use it up front
+        film.pk = existing.pk
+        film._state.adding = False
+
+    # ---------- People (directors + top 5 cast) ----------
+    people = []
+    for crew_member in credits.get("crew", []):
+        if crew_member.get("job") == "Director":
+            people.append(
+                (
+                    crew_member["id"],
+                    crew_member["name"],
+                    FilmPerson.Role.DIRECTOR,
+                    0,
+                )
+            )
+    for cast_member in credits.get("cast", [])[:5]:
+        order = cast_member.get("order") or 0
+        people.append(
+            (
+                cast_member["id"],
+                cast_member["name"],
+                FilmPerson.Role.CAST,
+                order,
+            )
+        )
+
+    related = {
+        "genres": details.get("genres", []),
+        "keywords": keywords_payload.get("keywords", [])[:10],
+        "people": people,
+    }
+    return film, related
+
+
+def _resolve(cache, new_rows, model, tmdb_id, name):
+    """Return the cached row for tmdb_id, queueing a new one if unseen."""
+    obj = cache.get(tmdb_id)
+    if obj is None:
+        obj = model(id=tmdb_id, tmdb_id=tmdb_id, name=name)
+        cache[tmdb_id] = obj
+        new_rows.append(obj)
+    return obj
+
+
+def save_films(batch, genre_cache, keyword_cache):
+    """
+    Upsert a batch of build_movie() results and wire up their genres,
+    keywords and people. The caches come from load_related_caches() and
+    are updated in place with any rows created here. Films that already
+    exist must be built with `existing` so they keep their primary key.
+    """
+    # One commit per batch rather than one per statement
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Safe for a re-runnable seed: a crash loses at most the last
+            # few pages, which the next run re-syncs
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = off")
+
+        # Films built from an existing row already carry its primary key;
+        # clear their genre/keyword links so the inserts below replace them
+        resynced_ids = [film.pk for film, _ in batch if not film._state.adding]
+
+        # Resolve related rows from the caches, queueing unseen ones
+        new_genres = []
+        new_keywords = []
+        # People are the largest related table, so rather than caching them
+        # all, insert each page's distinct people and skip existing ones
+        page_people = {}
+
+        wiring = []
+        for built, related in batch:
+            genre_instances = [
+                _resolve(genre_cache, new_genres, Genre, g["id"], g["name"])
+                for g in related["genres"]
+            ]
+            keyword_instances = [
+                _resolve(
+                    keyword_cache, new_keywords, Keyword, kw["id"], kw["name"]
+                )
+                for kw in related["keywords"]
+            ]
+            people_for_film = []
+            for pid, name, role, billing_order in related["people"]:
+                page_people.setdefault(pid, name)
+                people_for_film.append((pid, role, billing_order))
+            wiring.append(
+                (
+                    built,
+                    genre_instances,
+                    keyword_instances,
+                    people_for_film,
+                )
+            )
+
+        # New genres need a Film.genre_bitmask position before the films
+        # below can be encoded with them
+        if new_genres:
+            free_bits = Genre.free_bits(len(new_genres))
+            for genre, bit in zip(new_genres, free_bits):
+                genre.bit = bit
+
+        for film, genres, _, _ in wiring:
+            film.genre_bitmask = 0
+            for genre in genres:
+                film.genre_bitmask |= 1 << genre.bit
+
+        Film.objects.bulk_create(
+            [film for film, _ in batch],
+            update_conflicts=True,
+            unique_fields=["tmdb_id"],
+            update_fields=FILM_UPDATE_FIELDS,
+        )
+
+        Genre.objects.bulk_create(new_genres, ignore_conflicts=True)
+        Keyword.objects.bulk_create(new_keywords, ignore_conflicts=True)
+        # Person ids are TMDB ids, so the rows need no read back before
+        # FilmPerson can point at them
+        Person.objects.bulk_create(
+            [
+                Person(id=pid, tmdb_id=pid, name=name)
+                for pid, name in page_people.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+        if resynced_ids:
+            FilmGenre.objects.filter(film_id__in=resynced_ids).delete()
+            FilmKeyword.objects.filter(film_id__in=resynced_ids).delete()
+
+        filmgenre_batch = []
+        filmkeyword_batch = []
+        # Keyed by (film, person, role) so an actor credited twice on the
+        # same film only produces one row in the upsert
+        filmperson_batch = {}
+        for film, genres, keywords, people_for_film in wiring:
+            filmgenre_batch.extend(
+                FilmGenre(film=film, genre=genre) for genre in genres
+            )
+            filmkeyword_batch.extend(
+                FilmKeyword(film=film, keyword=keyword) for keyword in keywords
+            )
+
+            for person_id, role, billing_order in people_for_film:
+                filmperson_batch.setdefault(
+                    (film.pk, person_id, role),
+                    FilmPerson(
+                        film=film,
+                        person_id=person_id,
+                        role=role,
+                        billing_order=billing_order,
+                    ),
+                )
+
+        FilmGenre.objects.bulk_create(filmgenre_batch, ignore_conflicts=True)
+        FilmKeyword.objects.bulk_create(
+            filmkeyword_batch, ignore_conflicts=True
+        )
+
+        # unique_together (film, person, role) is the conflict target
+        FilmPerson.objects.bulk_create(
+            filmperson_batch.values(),
+            update_conflicts=True,
+            unique_fields=["film", "person", "role"],
+            update_fields=["billing_order"],
+        )
+
+    # Bulk writes skip model signals, so expire cached results here. With
+    # the per-process LocMemCache this only reaches the syncing process;
+    # web workers wait out COMPROMISE_CACHE_TIMEOUT.
+    invalidate_compromise_cache()
@@ -1,39 +1,56 @@
+import heapq
+import uuid
+from collections import Counter
+from urllib.parse import urlencode
+
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.core.cache import cache
+from django.utils.cache import patch_cache_control
 
 from django.db.models import (
-    Avg,
     Count,
-    Exists,
-    OuterRef,
-    BooleanField,
     Value,
     Q,
     Case,
     When,
     IntegerField,
     F,
+    Prefetch,
 )
 
 from django.contrib.auth import get_user_model
 
-from .models import Film
+from .models import Film, FilmGenre, FilmKeyword, FilmPerson
 from .serializers import (
     FilmSerializer,
     ForYouFilmSerializer,
     CompromiseRequestSerializer,
     FilmCardLiteSerializer,
 )
-from .services.compromise import get_compromise_films
+from .services.compromise import (
+    compromise_cache_version,
+    get_compromise_films,
+)
+from .services.interactions import (
+    INTERACTIONS_CACHE_TIMEOUT,
+    get_user_interactions,
+    get_user_preferences,
+    user_cache_key,
+)
 from favourites.models import Favourite
 from watchlist.models import Watchlist
-from reviews.models import Review
+from profiles.models import UserProfile
 
 User = get_user_model()
 
+# Blend rankings only change with the catalog, which bumps the version in
+# the cache key. Bumps stay within one process's LocMemCache, so keep the
+# timeout as short as the compromise one.
+BLEND_CACHE_TIMEOUT = 5 * 60
+
 
 class FilmViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -56,42 +73,19 @@ class FilmViewSet(viewsets.ReadOnlyModelViewSet):
         params = request.query_params
 
         # prefetch M2M so nested genres/keywords/people are efficient
-        qs = Film.objects.all().prefetch_related(
-            "genres", "keywords", "people"
-        )
+        qs = Film.api_queryset()
 
         # basic filters
         search = params.get("search")
         if search:
+            # served by the pg_trgm index on UPPER(title) in PostgreSQL
             qs = qs.filter(title__icontains=search)
 
         year = params.get("year")
         if year:
             qs = qs.filter(year=year)
 
-        # review stats
-        qs = qs.annotate(
-            average_rating=Avg("reviews__rating"),
-            review_count=Count("reviews", distinct=True),
-        )
-
-        # user-specific flags
-        if user.is_authenticated:
-            qs = qs.annotate(
-                is_favourited=Exists(
-                    Favourite.objects.filter(user=user, film=OuterRef("pk"))
-                ),
-                in_watchlist=Exists(
-                    Watchlist.objects.filter(user=user, film=OuterRef("pk"))
-                ),
-            )
-        else:
-            qs = qs.annotate(
-                is_favourited=Value(False, output_field=BooleanField()),
-                in_watchlist=Value(False, output_field=BooleanField()),
-            )
-
-        # filters using annotations
+        # filters using stored review stats and the user's film id sets
         min_rating = params.get("min_rating")
         if min_rating:
             try:
@@ -106,7 +100,7 @@ class FilmViewSet(viewsets.ReadOnlyModelViewSet):
             and favourited.lower() == "true"
             and user.is_authenticated
         ):
-            qs = qs.filter(is_favourited=True)
+            qs = qs.filter(id__in=self.get_user_film_ids()[0])
 
         in_watchlist = params.get("in_watchlist")
         if (
@@ -114,10 +108,71 @@ class FilmViewSet(viewsets.ReadOnlyModelViewSet):
             and in_watchlist.lower() == "true"
             and user.is_authenticated
         ):
-            qs = qs.filter(in_watchlist=True)
+            qs = qs.filter(id__in=self.get_user_film_ids()[1])
 
         return qs
 
+    def list(self, request, *args, **kwargs):
+        # Anonymous lists carry no per-user flags, so the same query string
+        # always renders the same films; cache them for a minute
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        cache_key = "film_list_anon_" + urlencode(
+            sorted(request.query_params.lists()), doseq=True
+        )
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return Response(cached_result)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, 60)
+        return response
+
+    def get_user_film_ids(self):
+        """
+        (favourite film ids, watchlist film ids) for the requesting user,
+        read once per request.
+
+        Fetching the two small id sets replaces an Exists() subquery per
+        listed film for each flag.
+        """
+        if not hasattr(self, "_user_film_ids"):
+            user = self.request.user
+            if user.is_authenticated:
+                self._user_film_ids = (
+                    set(
+                        Favourite.objects.filter(user=user).values_list(
+                            "film_id", flat=True
+                        )
+                    ),
+                    set(
+                        Watchlist.objects.filter(user=user).values_list(
+                            "film_id", flat=True
+                        )
+                    ),
+                )
+            else:
+                self._user_film_ids = (set(), set())
+        return self._user_film_ids
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        favourite_ids, watchlist_ids = self.get_user_film_ids()
+        context["favourite_film_ids"] = favourite_ids
+        context["watchlist_film_ids"] = watchlist_ids
+        return context
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if request.user.is_authenticated:
+            # is_favourited/in_watchlist are per-user, so keep list and
+            # detail responses out of shared caches, as For You does
+            patch_cache_control(response, private=True, max_age=60)
+        return response
+
 
 class BlendView(APIView):
     """
@@ -146,54 +201,138 @@ class BlendView(APIView):
             )
 
         try:
-            # prefetch related M2M so get_ids is efficient
-            film_a = Film.objects.prefetch_related(
-                "genres", "keywords", "people"
-            ).get(pk=film_a_id)
-            film_b = Film.objects.prefetch_related(
-                "genres", "keywords", "people"
-            ).get(pk=film_b_id)
+            film_a = Film.objects.only("id", "genre_bitmask").get(pk=film_a_id)
+            film_b = Film.objects.only("id", "genre_bitmask").get(pk=film_b_id)
         except Film.DoesNotExist:
             return Response(
                 {"detail": "One or both films were not found."},
                 status=404,
             )
 
-        # helper to pull related ids;
-        def get_ids(film, attr_name):
-            related = getattr(film, attr_name, None)
-            if related is None:
-                return set()
-            return set(related.values_list("id", flat=True))
+        # the ranking is symmetric in A and B and shared by all users, so
+        # it is cached per unordered pair; catalog changes bump the version
+        low_id, high_id = sorted([film_a.id, film_b.id])
+        cache_key = f"blend:{compromise_cache_version()}:{low_id}:{high_id}"
+        ranked_ids, fit_scores = cache.get_or_set(
+            cache_key,
+            lambda: self.rank_films(film_a, film_b),
+            BLEND_CACHE_TIMEOUT,
+        )
+        if not ranked_ids:
+            return Response({"results": []})
+
+        # candidates were read as bare ids, so load the top films' rows;
+        # the flags come from the user's cached id sets, not subqueries
+        interactions = get_user_interactions(request.user.id)
+        qs = Film.api_queryset().filter(id__in=ranked_ids)
+
+        # preserve ranking order
+        film_by_id = {f.id: f for f in qs}
+        ordered_films = [
+            film_by_id[fid] for fid in ranked_ids if fid in film_by_id
+        ]
+
+        data = FilmSerializer(
+            ordered_films,
+            many=True,
+            context={
+                "request": request,
+                "favourite_film_ids": interactions["favourited"],
+                "watchlist_film_ids": interactions["watchlist"],
+            },
+        ).data
 
-        genres_a = get_ids(film_a, "genres")
-        genres_b = get_ids(film_b, "genres")
+        # attach fit_score; serialized ids are strings, so key by film
+        for film, item in zip(ordered_films, data):
+            item["fit_score"] = fit_scores[film.id]
 
-        keywords_a = get_ids(film_a, "keywords")
-        keywords_b = get_ids(film_b, "keywords")
+        return Response({"results": data})
 
-        people_a = get_ids(film_a, "people")
-        people_b = get_ids(film_b, "people")
+    def rank_films(self, film_a, film_b):
+        """
+        Score every film sharing a genre, keyword or person with A or B.
+
+        Returns the top 5 film ids, best first, and their 0-100 fit_score.
+        """
+
+        # helper to read both films' related ids from one through table
+        def get_ids(through, column):
+            ids = {film_a.id: set(), film_b.id: set()}
+            for film_id, related_id in through.objects.filter(
+                film_id__in=ids
+            ).values_list("film_id", column):
+                ids[film_id].add(related_id)
+            return ids[film_a.id], ids[film_b.id]
+
+        keywords_a, keywords_b = get_ids(FilmKeyword, "keyword_id")
+        people_a, people_b = get_ids(FilmPerson, "person_id")
+
+        # per candidate: how many of its related ids are in A's set plus
+        # how many are in B's, counted from through-table rows that are
+        # already narrowed to A/B's ids
+        def count_matches(through, column, ids_a, ids_b):
+            matches = Counter()
+            if not (ids_a or ids_b):
+                return matches
+            # each related id is worth 1 per reference film it belongs to,
+            # so the row loop is a single dict lookup
+            hits = {
+                related_id: (related_id in ids_a) + (related_id in ids_b)
+                for related_id in ids_a | ids_b
+            }
+            # distinct (with the through model's ordering cleared): a person
+            # can be on a film as both director and cast
+            for film_id, related_id in (
+                through.objects.filter(**{f"{column}__in": hits})
+                .values_list("film_id", column)
+                .order_by()
+                .distinct()
+            ):
+                matches[film_id] += hits[related_id]
+            return matches
 
-        combined_genre_ids = genres_a | genres_b
-        combined_keyword_ids = keywords_a | keywords_b
-        combined_person_ids = people_a | people_b
+        keyword_matches = count_matches(
+            FilmKeyword, "keyword_id", keywords_a, keywords_b
+        )
+        person_matches = count_matches(
+            FilmPerson, "person_id", people_a, people_b
+        )
 
-        # base candidates: share at least one genre/keyword/person with A or B
-        candidates = Film.objects.exclude(id__in=[film_a.id, film_b.id])
+        # genres are matched on the denormalized Film.genre_bitmask: a
+        # candidate's genre matches are two ANDs and popcounts
+        genre_bits_a = film_a.genre_bitmask
+        genre_bits_b = film_b.genre_bitmask
 
+        # candidates: films sharing at least one genre/keyword/person with
+        # A or B, in the default Film ordering (the tie-break below)
         filter_q = Q()
-        if combined_genre_ids:
-            filter_q |= Q(genres__id__in=combined_genre_ids)
-        if combined_keyword_ids:
-            filter_q |= Q(keywords__id__in=combined_keyword_ids)
-        if combined_person_ids:
-            filter_q |= Q(people__id__in=combined_person_ids)
+        if genre_bits_a | genre_bits_b:
+            filter_q |= Q(
+                id__in=FilmGenre.objects.filter(
+                    genre_id__in=FilmGenre.objects.filter(
+                        film_id__in=[film_a.id, film_b.id]
+                    ).values("genre_id")
+                ).values("film_id")
+            )
+        for through, column, ids in (
+            (FilmKeyword, "keyword_id", keywords_a | keywords_b),
+            (FilmPerson, "person_id", people_a | people_b),
+        ):
+            if ids:
+                filter_q |= Q(
+                    id__in=through.objects.filter(
+                        **{f"{column}__in": ids}
+                    ).values("film_id")
+                )
 
         if filter_q:
-            candidates = candidates.filter(filter_q).distinct()
+            candidates = (
+                Film.objects.exclude(id__in=[film_a.id, film_b.id])
+                .filter(filter_q)
+                .values_list("id", "genre_bitmask")
+            )
         else:
-            candidates = Film.objects.none()
+            candidates = []
 
         # score each candidate in Python
         scores = {}
@@ -203,82 +342,33 @@ class BlendView(APIView):
         W_KEYWORD = 1.5
         W_PERSON = 1.0
 
-        for film in candidates.prefetch_related(
-            "genres", "keywords", "people"
-        ):
-            cg = set(get_ids(film, "genres"))
-            ck = set(get_ids(film, "keywords"))
-            cp = set(get_ids(film, "people"))
-
+        for film_id, genre_bits in candidates:
+            genre_matches = (genre_bits & genre_bits_a).bit_count() + (
+                genre_bits & genre_bits_b
+            ).bit_count()
             score = (
-                W_GENRE * (len(cg & genres_a) + len(cg & genres_b))
-                + W_KEYWORD * (len(ck & keywords_a) + len(ck & keywords_b))
-                + W_PERSON * (len(cp & people_a) + len(cp & people_b))
+                W_GENRE * genre_matches
+                + W_KEYWORD * keyword_matches[film_id]
+                + W_PERSON * person_matches[film_id]
             )
 
             if score > 0:
-                scores[film.id] = score
+                scores[film_id] = score
 
         if not scores:
-            return Response({"results": []})
+            return [], {}
 
         # normalise to a 0–100 "fit_score"
         max_score = max(scores.values()) or 1.0
 
-        ranked_ids = sorted(
-            scores.keys(),
-            key=lambda fid: scores[fid],
-            reverse=True,
-        )[:5]
+        # same order as a stable descending sort, without sorting them all
+        ranked_ids = heapq.nlargest(5, scores, key=scores.__getitem__)
 
         fit_scores = {
             fid: int(round(scores[fid] / max_score * 100))
             for fid in ranked_ids
         }
-
-        # reuse annotations from FilmViewSet for these films
-        user = request.user
-        qs = Film.objects.filter(id__in=ranked_ids).prefetch_related(
-            "genres", "keywords", "people"
-        )
-
-        qs = qs.annotate(
-            average_rating=Avg("reviews__rating"),
-            review_count=Count("reviews", distinct=True),
-        )
-
-        if user.is_authenticated:
-            qs = qs.annotate(
-                is_favourited=Exists(
-                    Favourite.objects.filter(user=user, film=OuterRef("pk"))
-                ),
-                in_watchlist=Exists(
-                    Watchlist.objects.filter(user=user, film=OuterRef("pk"))
-                ),
-            )
-        else:
-            qs = qs.annotate(
-                is_favourited=Value(False, output_field=BooleanField()),
-                in_watchlist=Value(False, output_field=BooleanField()),
-            )
-
-        # preserve ranking order
-        film_by_id = {f.id: f for f in qs}
-        ordered_films = [
-            film_by_id[fid] for fid in ranked_ids if fid in film_by_id
-        ]
-
-        data = FilmSerializer(
-            ordered_films,
-            many=True,
-            context={"request": request},
-        ).data
-
-        # attach fit_score
-        for item in data:
-            item["fit_score"] = fit_scores.get(item["id"], 0)
-
-        return Response({"results": data})
+        return ranked_ids, fit_scores
 
 
 class ForYouView(APIView):
@@ -296,172 +386,65 @@ class ForYouView(APIView):
     def get(self, request):
         user = request.user
 
-        # Check cache first (15 minute TTL)
-        cache_key = f"for_you_recommendations_{user.id}"
+        # Check cache first; keyed by the interaction version, so a new
+        # favourite, review or watchlist entry expires it
+        cache_key = user_cache_key(user.id, "response")
         cached_result = cache.get(cache_key)
-        if cached_result:
-            return Response(cached_result)
+        if cached_result is not None:
+            return self.private_response(cached_result)
 
         # Get user's profile and preferred genres
-        try:
-            profile = user.profile
-            preferred_genre_ids = (
-                set(profile.preferred_genres)
-                if profile.preferred_genres
-                else set()
-            )
-        except Exception:
-            preferred_genre_ids = set()
-
-        # If user hasn't set preferred genres, infer from their interactions
-        if not preferred_genre_ids:
-            # Get genres from favourited films
-            fav_genre_ids = set(
-                Favourite.objects.filter(user=user).values_list(
-                    "film__genres__id", flat=True
-                )
-            )
-            # Get genres from highly-rated reviews (7+)
-            reviewed_genre_ids = set(
-                Review.objects.filter(user=user, rating__gte=7).values_list(
-                    "film__genres__id", flat=True
-                )
-            )
-            preferred_genre_ids = fav_genre_ids | reviewed_genre_ids
-            # Remove None values if any
-            preferred_genre_ids.discard(None)
-
-        # Build genre affinity map (average rating per genre)
-        genre_affinity = {}
-        user_reviews = (
-            Review.objects.filter(user=user)
-            .select_related("film")
-            .prefetch_related("film__genres")
+        # (None when the user has no profile row)
+        preferred_genres = (
+            UserProfile.objects.filter(user=user)
+            .values_list("preferred_genres", flat=True)
+            .first()
         )
-        for review in user_reviews:
-            for genre in review.film.genres.all():
-                if genre.id not in genre_affinity:
-                    genre_affinity[genre.id] = {
-                        "total": 0,
-                        "count": 0,
-                        "name": genre.name,
-                    }
-                genre_affinity[genre.id]["total"] += review.rating
-                genre_affinity[genre.id]["count"] += 1
-
-        # Calculate average affinity per genre
-        for genre_id in genre_affinity:
-            total = genre_affinity[genre_id]["total"]
-            count = genre_affinity[genre.id]["count"]
-            genre_affinity[genre_id]["avg"] = (
-                total / count if count > 0 else 5.0
-            )
+        preferred_genre_ids = set(preferred_genres or ())
 
-        # Build director affinity map (average rating per director)
-        director_affinity = {}
-        user_reviews_for_affinity = Review.objects.filter(
-            user=user
-        ).prefetch_related("film__people")
-        for review in user_reviews_for_affinity:
-            for person in review.film.people.filter(
-                film_people__role="director"
-            ):
-                if person.id not in director_affinity:
-                    director_affinity[person.id] = {
-                        "total": 0,
-                        "count": 0,
-                        "name": person.name,
-                    }
-                director_affinity[person.id]["total"] += review.rating
-                director_affinity[person.id]["count"] += 1
-
-        # Calculate average affinity per director
-        for director_id in director_affinity:
-            total = director_affinity[director_id]["total"]
-            count = director_affinity[director_id]["count"]
-            director_affinity[director_id]["avg"] = (
-                total / count if count > 0 else 5.0
-            )
+        # Favourite/review/watchlist id sets, cached per user
+        interactions = get_user_interactions(user.id)
 
-        # Build keyword affinity map (average rating per keyword)
-        keyword_affinity = {}
-        user_reviews_keywords = Review.objects.filter(
-            user=user
-        ).prefetch_related("film__keywords")
-        for review in user_reviews_keywords:
-            for keyword in review.film.keywords.all():
-                if keyword.id not in keyword_affinity:
-                    keyword_affinity[keyword.id] = {
-                        "total": 0,
-                        "count": 0,
-                        "name": keyword.name,
-                    }
-                keyword_affinity[keyword.id]["total"] += review.rating
-                keyword_affinity[keyword.id]["count"] += 1
-
-        # Calculate average affinity per keyword
-        for keyword_id in keyword_affinity:
-            total = keyword_affinity[keyword_id]["total"]
-            count = keyword_affinity[keyword_id]["count"]
-            keyword_affinity[keyword_id]["avg"] = (
-                total / count if count > 0 else 5.0
-            )
+        # If user hasn't set preferred genres, infer from their interactions
+        # (genres of favourited and highly-rated films)
+        if not preferred_genre_ids:
+            preferred_genre_ids = set(interactions["liked_genres"])
 
         # Get user's interaction sets
-        favourited_film_ids = set(
-            Favourite.objects.filter(user=user).values_list(
-                "film_id", flat=True
-            )
-        )
-        reviewed_film_ids = set(
-            Review.objects.filter(user=user).values_list("film_id", flat=True)
-        )
-        highly_rated_film_ids = set(
-            Review.objects.filter(user=user, rating__gte=7).values_list(
-                "film_id", flat=True
-            )
-        )
-        watchlist_film_ids = set(
-            Watchlist.objects.filter(user=user).values_list(
-                "film_id", flat=True
-            )
-        )
+        favourited_film_ids = interactions["favourited"]
+        reviewed_film_ids = interactions["reviewed"]
+        watchlist_film_ids = interactions["watchlist"]
 
         # Get genres from user's favourite and highly-rated films for
         # similarity matching
-        user_liked_genres = set(
-            Film.objects.filter(
-                Q(id__in=favourited_film_ids) | Q(id__in=highly_rated_film_ids)
-            ).values_list("genres__id", flat=True)
-        )
-        user_liked_genres.discard(None)
-
-        # Get user's preferred directors (from favourited/highly-rated films)
-        user_liked_directors = set(
-            Film.objects.filter(
-                Q(id__in=favourited_film_ids) | Q(id__in=highly_rated_film_ids)
-            ).values_list("people__id", flat=True)
-        )
-        user_liked_directors.discard(None)
-
-        # Get user's preferred keywords/themes
-        user_liked_keywords = set(
-            Film.objects.filter(
-                Q(id__in=favourited_film_ids) | Q(id__in=highly_rated_film_ids)
-            ).values_list("keywords__id", flat=True)
-        )
-        user_liked_keywords.discard(None)
-
-        # Calculate user's preferred year range (from favourites/high ratings)
-        liked_years = list(
-            Film.objects.filter(
-                Q(id__in=favourited_film_ids) | Q(id__in=highly_rated_film_ids)
-            ).values_list("year", flat=True)
+        user_liked_genres = interactions["liked_genres"]
+
+        # Liked directors/keywords, preferred year and the average rating
+        # per genre/director/keyword, cached per user
+        preferences = get_user_preferences(user.id)
+        user_liked_directors = preferences["liked_directors"]
+        user_liked_keywords = preferences["liked_keywords"]
+        avg_year = preferences["avg_year"]
+        genre_affinity = preferences["genre_affinity"]
+        director_affinity = preferences["director_affinity"]
+        keyword_affinity = preferences["keyword_affinity"]
+
+        # Director links for scoring come from one prefetch; filtering
+        # film.people per film would bypass it and query once per film
+        director_links = FilmPerson.objects.filter(
+            role=FilmPerson.Role.DIRECTOR
+        ).order_by("person__name")
+
+        # Pre-filter candidates to drastically reduce the scoring pool;
+        # api_queryset() prefetches what ForYouFilmSerializer renders
+        candidates = Film.api_queryset().prefetch_related(
+            # scoring only reads each director's id
+            Prefetch(
+                "film_people",
+                queryset=director_links.only("film_id", "person_id"),
+                to_attr="director_links",
+            )
         )
-        avg_year = sum(liked_years) / len(liked_years) if liked_years else None
-
-        # Pre-filter candidates to drastically reduce the scoring pool
-        candidates = Film.objects.all()
 
         # Build filter: films that match user's interests
         filter_q = Q()
@@ -538,21 +521,14 @@ class ForYouView(APIView):
             genre_match_count=genre_overlap_score,
             director_match_count=director_overlap_score,
             keyword_match_count=keyword_overlap_score,
-            average_rating=Avg("reviews__rating"),
-            review_count=Count("reviews", distinct=True),
-            is_favourited=Exists(
-                Favourite.objects.filter(user=user, film=OuterRef("pk"))
-            ),
-            in_watchlist=Exists(
-                Watchlist.objects.filter(user=user, film=OuterRef("pk"))
-            ),
         )
 
         # Filter to films with at least some signal (genre or director match)
+        # or already on the watchlist
         candidates = candidates.filter(
             Q(genre_match_count__gt=0)
             | Q(director_match_count__gt=0)
-            | Q(in_watchlist=True)
+            | Q(id__in=watchlist_film_ids)
         )
 
         # Exclude already-reviewed films
@@ -691,9 +667,6 @@ class ForYouView(APIView):
         # Limit to top 100 candidates (still plenty for UX)
         candidates = candidates[:100]
 
-        # Prefetch only what we need for serialization
-        candidates = candidates.prefetch_related("genres", "keywords")
-
         # Simplified scoring: use the DB score and build minimal reasons
         scored_films = []
 
@@ -721,7 +694,7 @@ class ForYouView(APIView):
 
                         # Look up user's affinity for this specific genre
                         if genre.id in genre_affinity:
-                            avg_rating = genre_affinity[genre.id]["avg"]
+                            avg_rating = genre_affinity[genre.id]
 
                             # Apply smoother multiplier based on user's
                             # rating history
@@ -753,13 +726,13 @@ class ForYouView(APIView):
                 weighted_director_portion = 0
 
                 # For each director in the film, apply affinity multiplier
-                for person in film.people.filter(film_people__role="director"):
-                    if person.id in user_liked_directors:
+                for link in film.director_links:
+                    if link.person_id in user_liked_directors:
                         base_score = 5
 
                         # Look up user's affinity for this director
-                        if person.id in director_affinity:
-                            avg_rating = director_affinity[person.id]["avg"]
+                        if link.person_id in director_affinity:
+                            avg_rating = director_affinity[link.person_id]
 
                             # Apply smoother multiplier
                             if avg_rating >= 8.0:
@@ -801,7 +774,7 @@ class ForYouView(APIView):
 
                         # Look up user's affinity for this keyword
                         if keyword.id in keyword_affinity:
-                            avg_rating = keyword_affinity[keyword.id]["avg"]
+                            avg_rating = keyword_affinity[keyword.id]
 
                             # Apply smoother multiplier
                             if avg_rating >= 8.0:
@@ -850,7 +823,7 @@ class ForYouView(APIView):
             if film.director_match_count > 0 and len(reasons) < 2:
                 reasons.append("Director you like")
 
-            if film.in_watchlist and len(reasons) < 2:
+            if film.id in watchlist_film_ids and len(reasons) < 2:
                 reasons.append("On your watchlist")
 
             # Use raw score, but ceiling acts as a FLOOR (minimum guarantee)
@@ -878,14 +851,28 @@ class ForYouView(APIView):
             results.append(film)
 
         # Use ForYouFilmSerializer
+        # Flags come from the user's id sets rather than an Exists()
+        # subquery per candidate
         serializer = ForYouFilmSerializer(
-            results, many=True, context={"request": request}
+            results,
+            many=True,
+            context={
+                "request": request,
+                "favourite_film_ids": favourited_film_ids,
+                "watchlist_film_ids": watchlist_film_ids,
+            },
         )
 
-        # Cache the result for 15 minutes
-        cache.set(cache_key, serializer.data, 60 * 15)
+        cache.set(cache_key, serializer.data, INTERACTIONS_CACHE_TIMEOUT)
 
-        return Response(serializer.data)
+        return self.private_response(serializer.data)
+
+    def private_response(self, data):
+        # Per-user recommendations: browsers may reuse them briefly, shared
+        # caches must not; ConditionalGetMiddleware adds the ETag
+        response = Response(data)
+        patch_cache_control(response, private=True, max_age=60)
+        return response
 
 
 class CompromiseView(APIView):
@@ -909,27 +896,61 @@ class CompromiseView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @staticmethod
+    def _fast_validate(data):
+        """
+        Validate the common JSON request shape without building
+        CompromiseRequestSerializer.
+
+        Returns the validated values, or None for anything unusual so the
+        serializer handles it (and produces the error messages).
+        """
+        try:
+            film_a_id = uuid.UUID(data["film_a_id"])
+            film_b_id = uuid.UUID(data["film_b_id"])
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        if film_a_id == film_b_id:
+            return None
+
+        alpha = data.get("alpha", 0.5)
+        limit = data.get("limit", 20)
+        if type(alpha) not in (int, float) or not 0 <= alpha <= 1:
+            return None
+        if type(limit) is not int or not 0 < limit <= 50:
+            return None
+
+        return {
+            "film_a_id": film_a_id,
+            "film_b_id": film_b_id,
+            "alpha": float(alpha),
+            "limit": limit,
+        }
+
     def post(self, request):
         """Handle POST request for compromise/blend."""
         # Validate input
-        serializer = CompromiseRequestSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(
-                serializer.errors,
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        validated_data = self._fast_validate(request.data)
+        if validated_data is None:
+            serializer = CompromiseRequestSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(
+                    serializer.errors,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            validated_data = serializer.validated_data
 
         # Extract validated data
-        film_a_id = serializer.validated_data["film_a_id"]
-        film_b_id = serializer.validated_data["film_b_id"]
-        alpha = serializer.validated_data["alpha"]
-        limit = serializer.validated_data["limit"]
-
-        # Fetch films from database
-        try:
-            film_a = Film.objects.get(id=film_a_id)
-            film_b = Film.objects.get(id=film_b_id)
-        except Film.DoesNotExist:
+        film_a_id = validated_data["film_a_id"]
+        film_b_id = validated_data["film_b_id"]
+        alpha = validated_data["alpha"]
+        limit = validated_data["limit"]
+
+        # Fetch both films in one query; scoring only needs their ids
+        films = Film.objects.only("id").in_bulk([film_a_id, film_b_id])
+        film_a = films.get(film_a_id)
+        film_b = films.get(film_b_id)
+        if film_a is None or film_b is None:
             return Response(
                 {"detail": "One or both films not found."},
                 status=status.HTTP_404_NOT_FOUND,
@@ -952,18 +973,19 @@ class CompromiseView(APIView):
             "returned": len(scored_results),
         }
 
-        # Serialize results
-        results_data = []
-        for result in scored_results:
-            film_data = FilmCardLiteSerializer(result["film"]).data
-            results_data.append(
-                {
-                    "film": film_data,
-                    "score": result["score"],
-                    "match": result["match"],
-                    "reasons": result["reasons"],
-                }
-            )
+        # One serializer renders every film card instead of one per result
+        film_cards = FilmCardLiteSerializer(
+            [result["film"] for result in scored_results], many=True
+        ).data
+        results_data = [
+            {
+                "film": film_card,
+                "score": result["score"],
+                "match": result["match"],
+                "reasons": result["reasons"],
+            }
+            for film_card, result in zip(film_cards, scored_results)
+        ]
 
         response_data = {
             "meta": meta,
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from films.models import Film
+from films.services.interactions import invalidate_user_interactions
+from .models import Review
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_film_review_stats(sender, instance, **kwargs):
+    # Keep the stored Film.average_rating / review_count in step with the
+    # film's reviews
+    Film.update_review_stats([instance.film_id])
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def expire_user_interactions(sender, instance, **kwargs):
+    invalidate_user_interactions(instance.user_id)
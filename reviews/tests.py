@@ -1,11 +1,13 @@
 # reviews/tests.py
 
+from django.core.cache import cache
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 
-from films.models import Film
+from films.models import Film, Genre
+from films.services.interactions import get_user_preferences
 from .models import Review
 
 User = get_user_model()
@@ -13,6 +15,10 @@ User = get_user_model()
 
 class ReviewAPITests(APITestCase):
     def setUp(self):
+        # For You interaction caches are keyed by user id, which the test
+        # database can reuse between tests
+        cache.clear()
+
         # create user
         self.user = User.objects.create_user(
             username="testuser",
@@ -86,3 +92,43 @@ class ReviewAPITests(APITestCase):
             second_response.status_code, status.HTTP_400_BAD_REQUEST
         )
         self.assertEqual(Review.objects.count(), 1)
+
+    def test_film_review_stats_follow_reviews(self):
+        other = User.objects.create_user(
+            username="otheruser",
+            email="other@example.com",
+            password="testpass123",
+        )
+        review = Review.objects.create(
+            user=self.user, film=self.film, rating=8
+        )
+        Review.objects.create(user=other, film=self.film, rating=6)
+
+        self.film.refresh_from_db()
+        self.assertEqual(self.film.average_rating, 7.0)
+        self.assertEqual(self.film.review_count, 2)
+
+        review.delete()
+        self.film.refresh_from_db()
+        self.assertEqual(self.film.average_rating, 6.0)
+        self.assertEqual(self.film.review_count, 1)
+
+    def test_review_changes_expire_cached_preferences(self):
+        genre = Genre.objects.create(id=1, tmdb_id=1, name="Drama", bit=0)
+        self.film.genres.add(genre)
+        self.assertEqual(
+            get_user_preferences(self.user.id)["genre_affinity"], {}
+        )
+
+        review = Review.objects.create(
+            user=self.user, film=self.film, rating=8
+        )
+        self.assertEqual(
+            get_user_preferences(self.user.id)["genre_affinity"],
+            {genre.id: 8.0},
+        )
+
+        review.delete()
+        self.assertEqual(
+            get_user_preferences(self.user.id)["genre_affinity"], {}
+        )
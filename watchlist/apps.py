@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WatchlistConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "watchlist"
+
+    def ready(self):
+        from . import signals  # noqa
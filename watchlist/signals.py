@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from films.services.interactions import invalidate_user_interactions
+from .models import Watchlist
+
+
+@receiver(post_save, sender=Watchlist)
+@receiver(post_delete, sender=Watchlist)
+def expire_user_interactions(sender, instance, **kwargs):
+    invalidate_user_interactions(instance.user_id)